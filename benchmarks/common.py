@@ -0,0 +1,121 @@
+# coding: utf8
+
+"""
+Helpers shared by pygrim benchmarks.
+
+Benchmarks are plain scripts, run them from repository root, e.g.
+    python benchmarks/routing.py --sizes 1000,20000
+"""
+
+from __future__ import print_function
+
+from itertools import cycle, islice
+from os import path
+from timeit import default_timer
+import gc
+import sys
+
+# calls measured for allocated objects at least
+ALLOCATION_LOOPS = 1000
+
+# benchmark the checked out tree, not installed pygrim
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+
+class BenchConfig(dict):
+    """
+    Flat stand-in for pygrim config, keys are looked up as whole
+    """
+
+    def get(self, key, default=None):
+        return super(BenchConfig, self).get(key, default)
+
+    def getbool(self, key, default=None):
+        return bool(self.get(key, default))
+
+    def getint(self, key, default=None):
+        return int(self.get(key, default))
+
+
+def bench(func, args, min_time=0.2):
+    """
+    Calls func with each item of args (cyclically) until min_time elapses,
+    returns (ns/op, objects/op), see _allocated_objects
+    """
+    loops = len(args)
+    while True:
+        elapsed = _timed(func, args, loops)
+        if elapsed >= min_time:
+            break
+
+        loops *= 2 if elapsed <= 0 else max(2, int(min_time / elapsed) + 1)
+
+    return elapsed * 1e9 / loops, _allocated_objects(
+        func, args, max(len(args), ALLOCATION_LOOPS)
+    )
+
+
+def live_objects(factory, count=1000):
+    """
+    Returns gc-tracked objects per object created by factory, while all
+    created objects are alive
+    """
+    enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        before = gc.get_count()[0]
+        created = [factory() for unused_ in xrange(count)]
+        after = gc.get_count()[0]
+    finally:
+        if enabled:
+            gc.enable()
+
+    # list holding created objects is tracked too
+    return float(after - before - 1) / len(created)
+
+
+def print_results(title, rows):
+    """
+    Prints rows of (name, (ns/op, objects/op)) as table
+    """
+    print(title)
+    print("%-44s %12s %10s" % ("", "ns/op", "objs/op"))
+    for name, (ns_per_op, objects_per_op) in rows:
+        print("%-44s %12.0f %10.2f" % (name, ns_per_op, objects_per_op))
+
+    print()
+
+
+def _allocated_objects(func, args, loops):
+    # python 2 has no allocation tracing (tracemalloc), objects allocated
+    # by calls are counted by growth of gc.get_objects() while results of
+    # calls are kept and collection is disabled: objects returned by call
+    # (func returns what it allocated), kept by it (caches, leaks) and
+    # left in reference cycles are counted, unnamed temporaries and
+    # objects not tracked by gc (strings, numbers) are not
+    items = list(islice(cycle(args), loops))
+    results = []
+    enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        before = len(gc.get_objects())
+        for item in items:
+            results.append(func(item))
+
+        after = len(gc.get_objects())
+    finally:
+        if enabled:
+            gc.enable()
+
+    return float(after - before) / loops
+
+
+def _timed(func, args, loops):
+    items = list(islice(cycle(args), loops))
+    start = default_timer()
+    for item in items:
+        func(item)
+
+    return default_timer() - start
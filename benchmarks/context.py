@@ -0,0 +1,111 @@
+# coding: utf8
+
+"""
+Request objects benchmark: cost of Context (with Request and Response)
+per request, with and without context pool. Context with __dict__ (as it
+was before __slots__) is measured alongside for comparison.
+
+    python benchmarks/context.py [--headers 20]
+"""
+
+from __future__ import print_function
+
+from common import bench, BenchConfig, live_objects, print_results
+
+from argparse import ArgumentParser
+from StringIO import StringIO
+from sys import getsizeof
+
+from pygrim.http import Context, ContextPool, Request, Response
+
+
+class DictContext(Context):
+    # subclass without __slots__ gets __dict__ (and __weakref__)
+    pass
+
+
+def environment(headers):
+    env = {
+        "HTTP_ACCEPT": "application/json",
+        "HTTP_COOKIE": "session=abc; cookie_accept=F",
+        "HTTP_HOST": "example.com",
+        "PATH_INFO": "/api/items/42",
+        "QUERY_STRING": "page=2&sort=name",
+        "REMOTE_ADDR": "10.0.0.1",
+        "REQUEST_METHOD": "GET",
+        "SERVER_NAME": "example.com",
+        "SERVER_PORT": "80",
+        "wsgi.input": StringIO(""),
+        "wsgi.url_scheme": "http"
+    }
+    env.update(
+        ("HTTP_X_EXTRA_%d" % num, "value %d" % num)
+        for num
+        in xrange(headers)
+    )
+    return env
+
+
+def json_request(context):
+    # the way cheap json endpoints use context
+    context.GET("page")
+    context.set_response_content_type("application/json")
+    context.set_response_body('{"id": 42}')
+    context.finalize_response()
+    context.get_response_status_code()
+    return context.get_response_headers()
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--headers", type=int, default=20)
+    parser.add_argument("--min-time", type=float, default=0.5)
+    args = parser.parse_args()
+
+    config = BenchConfig()
+    env = environment(args.headers)
+    pool = ContextPool(1)
+
+    def create(unused_=None, context_class=Context):
+        return context_class(dict(env), config, Request, Response)
+
+    def create_dict(unused_=None):
+        return create(context_class=DictContext)
+
+    def pooled(unused_):
+        context = pool.acquire(Context, dict(env), config, Request, Response)
+        json_request(context)
+        pool.release(context)
+
+    rows = [
+        ("Context()", bench(create, [None], args.min_time)),
+        ("Context() with __dict__", bench(
+            create_dict, [None], args.min_time
+        )),
+        ("Context() + json response", bench(
+            lambda unused_: json_request(create()), [None], args.min_time
+        )),
+        ("Context() with __dict__ + json response", bench(
+            lambda unused_: json_request(create_dict()), [None],
+            args.min_time
+        )),
+        ("pooled Context + json response", bench(
+            pooled, [None], args.min_time
+        ))
+    ]
+    print_results("%d extra headers" % args.headers, rows)
+
+    context = create()
+    print("live gc objects per Context: %.1f (with __dict__ %.1f)" % (
+        live_objects(create), live_objects(create_dict)
+    ))
+    print(
+        "bytes of Context/Request/Response: %d/%d/%d (with __dict__ %d)" % (
+            getsizeof(context), getsizeof(context._request),
+            getsizeof(context._response), getsizeof(create_dict())
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
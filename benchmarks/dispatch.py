@@ -0,0 +1,218 @@
+# coding: utf8
+
+"""
+Dispatch benchmark: request handling with routing exceptions
+(DispatchFinished, RoutePassed) and with returned dispatch results.
+Besides whole wsgi requests, Server._handle_by_route and decorated
+handlers are called directly with one context, without request parsing,
+response finalization and context creation.
+
+    python benchmarks/dispatch.py [--passes 2]
+"""
+
+from __future__ import print_function
+
+from common import bench, print_results
+
+from argparse import ArgumentParser
+from StringIO import StringIO
+
+from pygrim import method, Route, Server, template_method
+from pygrim.components.config import AbstractConfig
+from pygrim.components.routing import (
+    DispatchFinished, PASSED, RoutePassed
+)
+from pygrim.components.view.base_view import BaseView
+from pygrim.server import register_view_class
+
+register_view_class("bench", BaseView)
+
+
+class BenchServerConfig(AbstractConfig):
+
+    SEPARATOR = ":"
+
+    def _load_config(self, path):
+        # path is config itself
+        return path
+
+
+class BenchServer(Server):
+
+    dispatch_results = False
+
+    def _find_config_class(self):
+        self._config_dir = ""
+        return {
+            "logging": {"file": "/dev/null", "level": "ERROR", "loggers": {}},
+            "pygrim": {
+                "debug": False,
+                "dispatch_results": self.dispatch_results
+            },
+            "session": {"enabled": False},
+            "view": {"type": "bench"}
+        }, BenchServerConfig
+
+    def _route_register_func(self, router):
+        router.map(Route("GET", "/page", "page"))
+        for num in xrange(self.passes):
+            router.map(Route("GET", "/passed", "passing%d" % num))
+
+        router.map(Route("GET", "/passed", "page"))
+        router.map(Route("GET", "/redirect", "moved"))
+
+    @template_method("page.jinja")
+    def page(self, context):
+        return {"data": {"id": 42}}
+
+    @method()
+    def moved(self, context):
+        return self.redirect(context, url="/page", status=301)
+
+
+def passing_raise(self, context):
+    raise RoutePassed()
+
+
+def passing_return(self, context):
+    return PASSED
+
+
+def server_class(passes, dispatch_results):
+    attrs = {"dispatch_results": dispatch_results, "passes": passes}
+    for num in xrange(passes):
+        attrs["passing%d" % num] = method(dispatch_name="passing%d" % num)(
+            passing_return if dispatch_results else passing_raise
+        )
+
+    return type("BenchServer", (BenchServer,), attrs)
+
+
+def call_handler(handler, context):
+    try:
+        return handler(context=context)
+    except (DispatchFinished, RoutePassed):
+        pass
+
+
+def context_for(server, uri):
+    """
+    Returns context of request to uri with its matching routes
+    """
+    context = server._context_class(
+        environment(uri), server.config, server._requst_class,
+        server._response_class
+    )
+    return context, list(server.router.matching_routes(context))
+
+
+def environment(uri):
+    return {
+        "HTTP_HOST": "example.com",
+        "PATH_INFO": uri,
+        "QUERY_STRING": "",
+        "REQUEST_METHOD": "GET",
+        "SERVER_NAME": "example.com",
+        "SERVER_PORT": "80",
+        "wsgi.input": StringIO(""),
+        "wsgi.url_scheme": "http"
+    }
+
+
+def handle_by_route(server, route, context):
+    try:
+        return server._handle_by_route(route=route, context=context)
+    except RoutePassed:
+        pass
+
+
+def request(server, uri):
+    def start_response(status, headers):
+        pass
+
+    return "".join(server(environment(uri), start_response))
+
+
+def direct_calls(server, label, min_time):
+    page_context, (page_route,) = context_for(server, "/page")
+    passed_context, passed_routes = context_for(server, "/passed")
+    redirect_context, (redirect_route,) = context_for(server, "/redirect")
+    # route params are popped by dispatch, routes here have none
+    return (
+        ("_handle_by_route display (%s)" % label, bench(
+            lambda unused_: handle_by_route(server, page_route, page_context),
+            [None],
+            min_time
+        )),
+        ("_handle_by_route pass (%s)" % label, bench(
+            lambda unused_: handle_by_route(
+                server, passed_routes[0], passed_context
+            ),
+            [None],
+            min_time
+        )),
+        ("_handle_by_route redirect (%s)" % label, bench(
+            lambda unused_: handle_by_route(
+                server, redirect_route, redirect_context
+            ),
+            [None],
+            min_time
+        )),
+        ("decorated pass (%s)" % label, bench(
+            lambda unused_: call_handler(
+                server._methods["passing0"], passed_context
+            ),
+            [None],
+            min_time
+        )),
+        ("decorated redirect (%s)" % label, bench(
+            lambda unused_: call_handler(
+                server._methods["moved"], redirect_context
+            ),
+            [None],
+            min_time
+        ))
+    )
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--passes", type=int, default=2,
+        help="routes passing request before the handling one"
+    )
+    parser.add_argument("--min-time", type=float, default=0.5)
+    args = parser.parse_args()
+
+    rows = []
+    direct_rows = []
+    for dispatch_results, label in (
+        (False, "exceptions"), (True, "results")
+    ):
+        server = server_class(args.passes, dispatch_results)()
+        server.do_postfork()
+        rows.extend((
+            ("display (%s)" % label, bench(
+                lambda unused_: request(server, "/page"),
+                [None],
+                args.min_time
+            )),
+            ("display after %d passes (%s)" % (args.passes, label), bench(
+                lambda unused_: request(server, "/passed"),
+                [None],
+                args.min_time
+            )),
+            ("redirect (%s)" % label, bench(
+                lambda unused_: request(server, "/redirect"),
+                [None],
+                args.min_time
+            ))
+        ))
+        direct_rows.extend(direct_calls(server, label, args.min_time))
+
+    print_results("wsgi requests", rows)
+    print_results("direct calls", direct_rows)
+
+
+if __name__ == "__main__":
+    main()
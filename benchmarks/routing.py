@@ -0,0 +1,212 @@
+# coding: utf8
+
+"""
+Router benchmark: matching and url building over synthetic route tables.
+
+    python benchmarks/routing.py [--sizes 1000,5000,20000] [--cache 1024]
+        [--scan]
+"""
+
+from __future__ import print_function
+
+from common import bench, BenchConfig, print_results
+
+from argparse import ArgumentParser
+from random import Random
+from re import compile as re_compile
+
+from pygrim.components.routing import Route, RouteGroup, Router
+
+GROUP_SIZE = 10
+MISS_RATIO = 0.1
+# requests are drawn from distinct uris with power law skew, hot uris repeat
+REQUEST_SKEW = 3
+
+
+class BenchContext(object):
+
+    def __init__(self, method, uri):
+        self.current_route = None
+        self.route_params = None
+        self._method = method
+        self._uri = uri
+
+    def get_request_method(self):
+        return self._method
+
+    def get_request_uri(self):
+        return self._uri
+
+    def set_route_params(self, params=None):
+        self.route_params = params
+
+
+def build_router(size, seed, cache_size=0, url_for_memo=False):
+    """
+    Returns router with size routes and list of (method, uri) requests
+    which hit those routes, or miss them in MISS_RATIO of cases
+    """
+    random = Random(seed)
+    router = Router()
+    router.configure(BenchConfig({
+        "pygrim:route_cache_size": cache_size,
+        "pygrim:url_for_memo": url_for_memo
+    }))
+    requests = []
+    url_params = []
+    num = 0
+    while num < size:
+        kind = random.random()
+        if kind < 0.4:
+            # static, half of them with trailing slash
+            pattern = "/static%d/page%d%s" % (
+                num % 97, num, "/" if num % 2 else ""
+            )
+            router.map(Route(
+                ("GET", "POST"), pattern, "handle", name="r%d" % num
+            ))
+            requests.append(("GET", pattern.rstrip("/")))
+            url_params.append(("r%d" % num, {}))
+            num += 1
+        elif kind < 0.8:
+            router.map(Route(
+                "GET",
+                re_compile(
+                    r"/regex%d/item%d/(?P<id>[0-9]+)(/(?P<slug>[a-z-]+))?/"
+                    % (num % 89, num)
+                ),
+                "handle",
+                name="r%d" % num
+            ))
+            requests.append(("GET", "/regex%d/item%d/%d/some-slug" % (
+                num % 89, num, random.randint(1, 100000)
+            )))
+            url_params.append(("r%d" % num, {
+                "id": random.randint(1, 100000), "slug": "some-slug"
+            }))
+            num += 1
+        else:
+            group = num
+            routes = []
+            for unused_ in xrange(min(GROUP_SIZE, size - num)):
+                if num % 2:
+                    routes.append(Route(
+                        "GET", "/detail%d/" % num, "handle", name="r%d" % num
+                    ))
+                    requests.append(("GET", "/group%d/detail%d" % (
+                        group, num
+                    )))
+                    url_params.append(("r%d" % num, {}))
+                else:
+                    routes.append(Route(
+                        "GET",
+                        re_compile(r"/list%d/(?P<page>[0-9]+)" % num),
+                        "handle",
+                        name="r%d" % num
+                    ))
+                    requests.append(("GET", "/group%d/list%d/%d" % (
+                        group, num, random.randint(1, 100)
+                    )))
+                    url_params.append(("r%d" % num, {"page": 2, "q": "x"}))
+
+                num += 1
+
+            router.map(RouteGroup("/group%d" % group, routes))
+
+    misses = [
+        ("GET", "/regex%d/missing%d" % (random.randint(0, 88), miss))
+        for miss
+        in xrange(int(len(requests) * MISS_RATIO))
+    ]
+    requests = requests + misses
+    random.shuffle(requests)
+    random.shuffle(url_params)
+    return router, requests, url_params
+
+
+def request_mix(requests, count, seed):
+    """
+    Returns count requests, few of them hot and repeating
+    """
+    random = Random(seed)
+    return [
+        requests[int(len(requests) * random.random() ** REQUEST_SKEW)]
+        for unused_
+        in xrange(count)
+    ]
+
+
+def main():
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="1000,5000,20000")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument(
+        "--cache", type=int, default=1024, help="route cache size, 0 = off"
+    )
+    parser.add_argument(
+        "--scan", action="store_true", help="benchmark linear scan too"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--min-time", type=float, default=0.5)
+    args = parser.parse_args()
+
+    for size in map(int, args.sizes.split(",")):
+        rows = []
+        router, requests, url_params = build_router(size, args.seed)
+        url_params = request_mix(url_params, args.requests, args.seed)
+        contexts = [
+            BenchContext(method, uri)
+            for method, uri
+            in request_mix(requests, args.requests, args.seed)
+        ]
+        if args.scan:
+            rows.append(("matching_routes (linear scan)", bench(
+                _first_match(router), contexts, args.min_time
+            )))
+
+        router.finalize()
+        rows.append(("matching_routes (index)", bench(
+            _first_match(router), contexts, args.min_time
+        )))
+        if args.cache:
+            cached, unused_, unused_ = build_router(
+                size, args.seed, cache_size=args.cache
+            )
+            cached.finalize()
+            rows.append((
+                "matching_routes (index, cache %d)" % args.cache,
+                bench(_first_match(cached), contexts, args.min_time)
+            ))
+
+        rows.append(("Router.url_for", bench(
+            lambda item: router.url_for(*item),
+            url_params,
+            args.min_time
+        )))
+        routes = [
+            (router._get_named_route(name), params)
+            for name, params
+            in url_params
+        ]
+        rows.append(("Route.url_for", bench(
+            lambda item: item[0].url_for(item[1]),
+            routes,
+            args.min_time
+        )))
+        print_results("%d routes, %d distinct uris" % (
+            size, len(set(context.get_request_uri() for context in contexts))
+        ), rows)
+
+
+def _first_match(router):
+    def match(context):
+        # params are allocated by match too
+        return next(router.matching_routes(context), None), (
+            context.route_params
+        )
+
+    return match
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,7 @@ from .components import session
 from .decorators import (
     error_handler, error_method, method, not_found_method,
     template_display, template_method, uses_data, error_handler,
-    json_method, canonical_url,
+    json_method, canonical_url, conditional,
 )
 from .server import register_session_handler, register_view_class
 from .server import Server
@@ -0,0 +1,89 @@
+# coding: utf8
+
+from logging import getLogger
+from timeit import default_timer
+import gc
+
+log = getLogger("pygrim.components.gc_policy")
+
+GC_POLICIES = ("default", "deferred")
+
+
+class GcPolicy(object):
+    """
+    Decides when cyclic garbage collector runs in worker.
+    default  - python collects whenever allocation thresholds are reached,
+               that can be in the middle of template render
+    deferred - automatic collection is disabled, after each request python
+               collects what automatic gc would have collected by now
+               (thresholds are kept), up to generation 1; full collection
+               runs every full_interval requests
+    Collections run by policy are counted and timed.
+    """
+
+    def __init__(self, policy="default", full_interval=1000):
+        if policy not in GC_POLICIES:
+            raise RuntimeError("Unknown gc policy: %r." % policy)
+
+        self.deferred = policy == "deferred"
+        self._full_interval = full_interval
+        self._policy = policy
+        self._requests = 0
+        self._collections = [0, 0, 0]
+        self._collected = 0
+        self._pause_max = 0.0
+        self._pause_total = 0.0
+
+    def after_request(self):
+        """
+        Runs collection due after request, meant for deferred policy only
+        """
+        self._requests += 1
+        if self._full_interval and not self._requests % self._full_interval:
+            generation = 2
+        else:
+            generation = self._due_generation()
+            if generation is None:
+                return
+
+        start = default_timer()
+        collected = gc.collect(generation)
+        pause = default_timer() - start
+        self._collections[generation] += 1
+        self._collected += collected
+        self._pause_max = max(self._pause_max, pause)
+        self._pause_total += pause
+        log.debug(
+            "Generation %d collected after request in %.6fs, %d objects",
+            generation, pause, collected
+        )
+
+    def get_stats(self):
+        return {
+            "collected": self._collected,
+            "collections": list(self._collections),
+            "counts": list(gc.get_count()),
+            "enabled": gc.isenabled(),
+            "pause_max": self._pause_max,
+            "pause_total": self._pause_total,
+            "policy": self._policy,
+            "requests": self._requests,
+            "thresholds": list(gc.get_threshold())
+        }
+
+    def start(self):
+        """
+        Applies policy, called in worker
+        """
+        if self.deferred:
+            gc.disable()
+            log.debug("Automatic gc disabled, collecting between requests")
+
+    def _due_generation(self):
+        counts = gc.get_count()
+        thresholds = gc.get_threshold()
+        # zero threshold disables collection, as with automatic gc
+        if not thresholds[0] or counts[0] <= thresholds[0]:
+            return None
+
+        return 1 if counts[1] > thresholds[1] else 0
@@ -1,8 +1,15 @@
 # coding: utf8
 
 from .abstract_router import AbstractRouter
+from .analysis import RouteAnalyzer
+from .converters import register_converter
+from .dispatch_results import DispatchResult, FINISHED, PASSED, REDIRECT
 from .exceptions import (
-    DispatchFinished, MissingRouteHandle, RouteNotRegistered, RoutePassed
+    DispatchFinished, MissingRouteHandle, RouteNotRegistered, RoutePassed,
+    UnknownConverter
 )
 from .route import Route, RouteGroup
 from .router import Router
+from .snapshot import (
+    load_route_snapshot, routes_version, save_route_snapshot
+)
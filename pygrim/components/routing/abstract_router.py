@@ -5,3 +5,27 @@ class AbstractRouter(object):
 
     def __init__(self):
         raise NotImplementedError()
+
+    def after_request(self):
+        """
+        Called after response of every routed request is sent
+        """
+        pass
+
+    def allowed_methods(self, uri):
+        """
+        Returns set of HTTP methods some route accepts for given uri
+        """
+        return set()
+
+    def configure(self, config):
+        """
+        Called right after router is created, router may read its settings
+        """
+        pass
+
+    def finalize(self):
+        """
+        Called once all routes are mapped and have their handles assigned
+        """
+        pass
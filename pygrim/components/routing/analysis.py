@@ -0,0 +1,135 @@
+# coding: utf8
+
+from logging import getLogger
+
+from .route_index import literal_prefix
+from ..utils import PrefixTrie
+
+log = getLogger("pygrim.components.route_analysis")
+
+
+class RouteAnalyzer(object):
+    """
+    Static analysis of mapped routes.
+
+    Two routes overlap when some request can match both of them. Analyzer
+    is conservative: routes are reported as disjoint only when it is proven
+    (different methods, literal prefixes or static paths), so routes which
+    do not overlap can be reordered without changing dispatch semantics.
+    """
+
+    def __init__(self, routes):
+        self._routes = list(routes)
+        self._prefixes = [self._route_prefix(route) for route in self._routes]
+        self._pairs = None
+
+    def overlapping_pairs(self):
+        """
+        Returns sorted list of (earlier, later) route positions of routes
+        that may overlap
+        """
+        if self._pairs is None:
+            # overlapping routes have one literal prefix starting with other
+            trie = PrefixTrie()
+            for position, (prefix, unused_) in enumerate(self._prefixes):
+                trie.add(prefix, position)
+
+            pairs = set()
+            for position, (prefix, unused_) in enumerate(self._prefixes):
+                for other in trie.prefixes_of(prefix):
+                    pair = (min(other, position), max(other, position))
+                    if (
+                        other != position and
+                        pair not in pairs and
+                        self._overlap(*pair)
+                    ):
+                        pairs.add(pair)
+
+            self._pairs = sorted(pairs)
+            log.debug("Found %d overlapping route pairs", len(self._pairs))
+
+        return self._pairs
+
+    def shadowed_routes(self):
+        """
+        Returns list of (shadowed, shadowing) route positions, shadowed route
+        can only be reached when earlier shadowing route passes
+        """
+        shadowed = []
+        seen = set()
+        for first, second in self.overlapping_pairs():
+            if second not in seen and self._covers(first, second):
+                seen.add(second)
+                shadowed.append((second, first))
+
+        return shadowed
+
+    def _covers(self, first, second):
+        """
+        Tells whether every request matched by second is matched by first
+        """
+        covering = self._routes[first]
+        covered = self._routes[second]
+        if not set(covered.get_methods()) <= set(covering.get_methods()):
+            return False
+
+        if self._prefixes[second][1]:
+            return all(
+                covering.match_uri(uri) is not None
+                for uri
+                in self._whole_uris(second)
+            )
+
+        # converters may reject params the covered route accepts
+        return (
+            covering.is_regex() and
+            not covering._param_converters and
+            covering.pattern == covered.pattern and
+            covering._raw_pattern.flags == covered._raw_pattern.flags
+        )
+
+    def _overlap(self, first, second):
+        first_route = self._routes[first]
+        second_route = self._routes[second]
+        if not (
+            set(first_route.get_methods()) & set(second_route.get_methods())
+        ):
+            return False
+
+        if self._prefixes[first][1]:
+            return any(
+                second_route.match_uri(uri) is not None
+                for uri
+                in self._whole_uris(first)
+            )
+        if self._prefixes[second][1]:
+            return any(
+                first_route.match_uri(uri) is not None
+                for uri
+                in self._whole_uris(second)
+            )
+
+        return True
+
+    def _route_prefix(self, route):
+        """
+        Returns (prefix, whole), whole route matches nothing but its prefix
+        (with optional trailing slash)
+        """
+        if route.is_regex():
+            return literal_prefix(route._raw_pattern)
+
+        return route.pattern, True
+
+    def _whole_uris(self, position):
+        """
+        Returns uris matched by whole route, e.g. '/' for ^/?$
+        """
+        route = self._routes[position]
+        prefix = self._prefixes[position][0]
+        return [
+            uri
+            for uri
+            in (prefix, prefix + "/")
+            if route.match_uri(uri) is not None
+        ]
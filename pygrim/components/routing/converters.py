@@ -0,0 +1,51 @@
+# coding: utf8
+
+from .exceptions import UnknownConverter
+from re import compile as re_compile
+from uuid import UUID
+
+SLUG_REGEXP = re_compile(r"^[a-z0-9]+(?:-[a-z0-9]+)*$")
+
+
+def to_int(value):
+    # int() accepts surrounding whitespace and sign, url param may not
+    if not value.isdigit():
+        raise ValueError("Invalid int %r" % value)
+
+    return int(value)
+
+
+def to_slug(value):
+    if not SLUG_REGEXP.match(value):
+        raise ValueError("Invalid slug %r" % value)
+
+    return value
+
+
+def to_uuid(value):
+    return UUID(value)
+
+
+CONVERTERS = {
+    "int": to_int,
+    "slug": to_slug,
+    "uuid": to_uuid
+}
+
+
+def register_converter(name, converter):
+    """
+    Registers converter available to routes by name. Converter gets matched
+    string and raises ValueError (or TypeError) when it can't be converted.
+    """
+    CONVERTERS[name] = converter
+
+
+def resolve_converter(converter):
+    if callable(converter):
+        return converter
+
+    try:
+        return CONVERTERS[converter]
+    except KeyError:
+        raise UnknownConverter(converter)
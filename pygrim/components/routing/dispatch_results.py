@@ -0,0 +1,24 @@
+# coding: utf8
+
+
+class DispatchResult(object):
+    """
+    Result returned by route handler instead of raising routing exception.
+    Server checks results by identity, use module-level instances only.
+    """
+
+    __slots__ = ("_name",)
+
+    def __init__(self, name):
+        self._name = name
+
+    def __repr__(self):
+        return "<DispatchResult %s>" % self._name
+
+
+# request is handled, same as raising DispatchFinished
+FINISHED = DispatchResult("finished")
+# route does not handle request, next one is tried, same as raising RoutePassed
+PASSED = DispatchResult("passed")
+# redirect is set in context, request is handled
+REDIRECT = DispatchResult("redirect")
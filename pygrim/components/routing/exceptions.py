@@ -37,3 +37,11 @@ class RouteNotRegistered(BaseRoutingException):
 
 class RoutePassed(BaseRoutingException):
     pass
+
+
+class UnknownConverter(BaseRoutingException):
+
+    def __init__(self, name):
+        super(UnknownConverter, self).__init__(
+            "Route param converter %r is not registered." % name
+        )
@@ -7,6 +7,7 @@ import string
 import urllib
 
 # local
+from .converters import resolve_converter
 from ..utils import (
     ensure_string, ensure_tuple,
     fix_trailing_slash, is_regex, remove_trailing_slash
@@ -15,6 +16,18 @@ from ..utils import (
 log = logging.getLogger("pygrim.components.route")
 
 
+def _finish_url(url, query_params):
+    query = [
+        (ensure_string(key), ensure_string(value))
+        for key, value
+        in query_params
+    ]
+    if query:
+        url += "?" + urllib.urlencode(query)
+
+    return "/%s" % url.strip("/")
+
+
 class RouteObject(object):
 
     def __init__(self, pattern, *args, **kwargs):
@@ -59,7 +72,11 @@ class Route(RouteObject):
     URL_OPTIONAL_REGEXP = re.compile(r"\(([^)]*?)(%\(([^)]+)\)s)([^)]*?)\)\?")
     URL_PARAM_REGEXP = re.compile(r"\(\?P<([^>]+)>[^)]+\)")
 
-    def __init__(self, methods, pattern, handle_name, name=None):
+    def __init__(
+        self, methods, pattern, handle_name, name=None, converters=None
+    ):
+        # param name -> converter name or callable
+        self._converters = dict(converters or {})
         self._readable_pattern = ""
         self._required_params = set()
         self._optional_params = {}
@@ -75,6 +92,20 @@ class Route(RouteObject):
         )
         self._name = name
 
+    def __getstate__(self):
+        # handles are bound in postfork, builder and converters are rebuilt
+        # on load
+        state = self.__dict__.copy()
+        state["_handle"] = None
+        del state["_param_converters"]
+        del state["_url_builder"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._param_converters = self._compile_converters()
+        self._url_builder = self._compile_url_builder()
+
     def __repr__(self):
         return "%s(%r,%r,%r,%r,%r)" % (
             type(self), self._methods,
@@ -85,18 +116,76 @@ class Route(RouteObject):
     def assign_method(self, method):
         self._handle = method
 
+    def convert_params(self, route_params):
+        """
+        Applies param converters in place, returns None when some param
+        can't be converted
+        """
+        for param, converter in self._param_converters:
+            value = route_params[param]
+            if value is not None:
+                try:
+                    route_params[param] = converter(value)
+                except (TypeError, ValueError):
+                    log.debug(
+                        "Can't convert param %r=%r of route %r",
+                        param, value, self.pattern
+                    )
+                    return None
+
+        return route_params
+
     def dispatch(self, context):
-        self._handle(
+        return self._handle(
             context=context,
             **context.pop_route_params()
         )
 
+    def get_converter_names(self):
+        """
+        Returns names of registered converters used by this route
+        """
+        return set(
+            converter
+            for converter
+            in self._converters.itervalues()
+            if isinstance(converter, basestring)
+        )
+
     def get_handle_name(self):
         return self._handle_name
 
+    def get_methods(self):
+        return self._methods
+
     def get_name(self):
         return self._name
 
+    def has_converters(self):
+        return bool(self._converters)
+
+    def match_groups(self, uri):
+        """
+        Returns unconverted route params when uri matches route pattern,
+        None otherwise
+        """
+        if self.is_regex():
+            matches = self._raw_pattern.match(uri)
+            return matches.groupdict() if matches else None
+
+        return {} if self.pattern == uri else None
+
+    def match_uri(self, uri):
+        """
+        Returns route params when uri matches route pattern, None otherwise
+        """
+        route_params = self.match_groups(uri)
+        return (
+            None
+            if route_params is None
+            else self.convert_params(route_params)
+        )
+
     def matches(self, context):
         return (
             self._supports_http_method(context.get_request_method()) and
@@ -107,35 +196,64 @@ class Route(RouteObject):
         return getattr(self._handle, "_session", False)
 
     def url_for(self, params):
-        if self.is_regex():
-            for name in self._optional_params:
-                if params.get(name):
-                    params[name] = self._optional_params[name] % params[name]
-                else:
-                    params[name] = ""
-
-            query_params = {
-                key: params[key]
-                for key
-                in params.iterkeys()
-                if key not in (
-                    self._required_params.union(self._optional_params.iterkeys())
+        return self._url_builder(params)
+
+    def _compile_converters(self):
+        """
+        Returns ((param, converter), ...) for params of this route
+        """
+        # static route may yet become regex by mapping into regex group
+        if not (self._converters and self.is_regex()):
+            return ()
+
+        missing = set(self._converters) - set(self._raw_pattern.groupindex)
+        if missing:
+            raise RuntimeError(
+                "Converted params %r are missing in route %r" % (
+                    sorted(missing), self.pattern
                 )
-            }
-            url = self._readable_pattern % params
-        else:
-            url = self.pattern
-            query_params = params
+            )
+
+        return tuple(
+            (param, resolve_converter(converter))
+            for param, converter
+            in self._converters.iteritems()
+        )
 
-        if query_params:
-            url += "?" + urllib.urlencode([
-                (ensure_string(key), ensure_string(value))
-                for key, value
-                in query_params.iteritems()
-            ])
+    def _compile_url_builder(self):
+        """
+        Returns function constructing url of this route from params
+        """
+        if self.is_regex():
+            readable = self._readable_pattern
+            required = tuple(self._required_params)
+            optional = tuple(self._optional_params.iteritems())
+            route_keys = frozenset(required).union(self._optional_params)
+
+            def build_url(params):
+                values = {name: params[name] for name in required}
+                for name, optional_format in optional:
+                    value = params.get(name)
+                    values[name] = optional_format % value if value else ""
+
+                return _finish_url(readable % values, (
+                    (key, value)
+                    for key, value
+                    in params.iteritems()
+                    if key not in route_keys
+                ))
+        else:
+            pattern = self.pattern
+            plain_url = _finish_url(pattern, ())
+
+            def build_url(params):
+                return (
+                    _finish_url(pattern, params.iteritems())
+                    if params
+                    else plain_url
+                )
 
-        log.debug("Route constructed url: %r for params: %r", url, params)
-        return "/%s" % url.strip("/")
+        return build_url
 
     def _pattern_to_readable(self):
         if self.is_regex():
@@ -168,6 +286,8 @@ class Route(RouteObject):
         self._readable_pattern = readable
         self._required_params = req_params
         self._optional_params = optional_params
+        self._param_converters = self._compile_converters()
+        self._url_builder = self._compile_url_builder()
 
     def _supports_http_method(self, method):
         return method in self._methods
@@ -175,14 +295,8 @@ class Route(RouteObject):
     def _uri_matches(self, context):
         uri = context.get_request_uri()
         log.debug("matching %r with %r", self.pattern, uri)
-        if self.is_regex():
-            matches = self._raw_pattern.match(uri)
-            match = matches is not None
-            route_params = matches.groupdict() if matches else {}
-        else:
-            match = self.pattern == uri
-            route_params = {}
-
+        route_params = self.match_uri(uri)
+        match = route_params is not None
         if match:
             context.set_route_params(route_params)
 
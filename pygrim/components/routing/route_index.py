@@ -0,0 +1,474 @@
+# coding: utf8
+
+from heapq import heapify, heappop, heappush
+from logging import getLogger
+from re import compile as re_compile, error as re_error, IGNORECASE
+import sre_constants
+import sre_parse
+
+log = getLogger("pygrim.components.route_index")
+
+DEFAULT_REGEX_FLAGS = re_compile(r"").flags
+GROUP_NAME_REGEXP = re_compile(r"\(\?P<([^>]+)>")
+# python 2 re module refuses to compile patterns with more than 100 groups
+MAX_COMBINED_GROUPS = 100
+
+
+def literal_prefix(regex):
+    """
+    Returns (prefix, whole) where prefix is the literal text every uri matched
+    by regex has to start with and whole tells there is nothing but optional
+    trailing slash after the prefix
+    """
+    try:
+        parsed = sre_parse.parse(regex.pattern, regex.flags)
+    except (re_error, sre_constants.error):
+        return "", False
+
+    if parsed.pattern.flags & IGNORECASE:
+        return "", False
+
+    items = list(parsed)
+    if items and items[0] == (sre_constants.AT, sre_constants.AT_BEGINNING):
+        items = items[1:]
+
+    prefix = []
+    for op, value in items:
+        if op != sre_constants.LITERAL:
+            break
+        prefix.append(chr(value) if value < 256 else unichr(value))
+
+    rest = items[len(prefix):]
+    if rest and _is_optional_slash(*rest[0]):
+        rest = rest[1:]
+
+    whole = rest == [(sre_constants.AT, sre_constants.AT_END)]
+    return "".join(prefix), whole
+
+
+def uri_segment(uri):
+    return uri[1:].split("/", 1)[0] if uri.startswith("/") else None
+
+
+def _is_optional_slash(op, value):
+    return (
+        op == sre_constants.MAX_REPEAT and
+        value[:2] == (0, 1) and
+        list(value[2]) == [(sre_constants.LITERAL, ord("/"))]
+    )
+
+
+def _route_segment(route):
+    """
+    Returns (segment, complete), segment being (start of) the first path
+    segment of all uris matched by route
+    """
+    prefix, whole = literal_prefix(route._raw_pattern)
+    if not prefix.startswith("/"):
+        return "", False
+
+    slash = prefix.find("/", 1)
+    if slash != -1:
+        return prefix[1:slash], True
+
+    return prefix[1:], whole
+
+
+class CombinedMatcher(object):
+    """
+    Matches uri against several regex routes folded into one alternation.
+    Each route pattern is wrapped in its own group and its named groups
+    are renamed so that they do not clash among routes.
+    """
+
+    def __init__(self, entries, combined):
+        self._entries = entries
+        self._groups = {}
+        parts = []
+        for num, ((unused_, route), pattern) in enumerate(
+            zip(entries, combined)
+        ):
+            wrapper = "_r%d" % num
+            parts.append("(?P<%s>%s)" % (
+                wrapper, self._rename_groups(pattern, wrapper)
+            ))
+            self._groups[wrapper] = tuple(
+                (self._group_name(wrapper, name), name)
+                for name
+                in route._raw_pattern.groupindex
+            )
+
+        self._regex = re_compile("|".join(parts))
+        self._indexes = {
+            self._regex.groupindex[wrapper]: int(wrapper[2:])
+            for wrapper
+            in self._groups
+        }
+
+    @classmethod
+    def combinable(cls, route):
+        """
+        Returns route pattern when route can be part of combined regex
+        """
+        regex = route._raw_pattern
+        if regex.flags != DEFAULT_REGEX_FLAGS:
+            return None
+
+        pattern = cls._rename_groups(regex.pattern, "_r0")
+        try:
+            renamed = re_compile(pattern)
+        except re_error:
+            return None
+
+        expected = set(
+            cls._group_name("_r0", name)
+            for name
+            in regex.groupindex
+        )
+        if (
+            renamed.groups != regex.groups or
+            set(renamed.groupindex) != expected or
+            _has_group_reference(regex.pattern)
+        ):
+            return None
+
+        return regex.pattern
+
+    def group_matches(self, uri):
+        matches = self._regex.match(uri)
+        if matches is None:
+            return
+
+        num = self._indexes[matches.lastindex]
+        position, route = self._entries[num]
+        yield position, route, {
+            name: matches.group(renamed)
+            for renamed, name
+            in self._groups["_r%d" % num]
+        }
+
+        # fall-through after RoutePassed or failed param conversion,
+        # rare enough to go one by one
+        for position, route in self._entries[num + 1:]:
+            route_params = route.match_groups(uri)
+            if route_params is not None:
+                yield position, route, route_params
+
+    @staticmethod
+    def _group_name(wrapper, name):
+        return "%s_%s" % (wrapper, name)
+
+    @classmethod
+    def _rename_groups(cls, pattern, wrapper):
+        return GROUP_NAME_REGEXP.sub(
+            lambda m: "(?P<%s>" % cls._group_name(wrapper, m.group(1)),
+            pattern
+        )
+
+
+class SingleMatcher(object):
+
+    def __init__(self, entry):
+        self._entry = entry
+
+    def group_matches(self, uri):
+        position, route = self._entry
+        route_params = route.match_groups(uri)
+        if route_params is not None:
+            yield position, route, route_params
+
+
+class RegexBucket(object):
+    """
+    Ordered regex routes split into combined matchers, matchers yield
+    (position, route, route_params) with params not converted yet
+    """
+
+    def __init__(self, entries, combined):
+        self._matchers = []
+        chunk = []
+        chunk_groups = 0
+        for entry in entries:
+            pattern = combined.get(id(entry[1]))
+            route_groups = entry[1]._raw_pattern.groups + 1
+            if chunk and (
+                pattern is None or
+                chunk_groups + route_groups >= MAX_COMBINED_GROUPS
+            ):
+                self._add_chunk(chunk, combined)
+                chunk = []
+                chunk_groups = 0
+
+            if pattern is None:
+                self._matchers.append(SingleMatcher(entry))
+            else:
+                chunk.append(entry)
+                chunk_groups += route_groups
+
+        if chunk:
+            self._add_chunk(chunk, combined)
+
+    def __len__(self):
+        return len(self._matchers)
+
+    def group_matches(self, uri):
+        for matcher in self._matchers:
+            for match in matcher.group_matches(uri):
+                yield match
+
+    def _add_chunk(self, chunk, combined):
+        if len(chunk) == 1:
+            self._matchers.append(SingleMatcher(chunk[0]))
+        else:
+            self._matchers.append(CombinedMatcher(
+                chunk, [combined[id(route)] for unused_, route in chunk]
+            ))
+
+
+class RouteIndex(object):
+    """
+    Compiled lookup structure over mapped routes.
+
+    Static routes are answered by one dict lookup keyed by (method, path).
+    Regex routes are bucketed by method and by the first path segment taken
+    from their literal prefix; routes of one bucket are folded into combined
+    alternations, so dispatch cost grows with bucket size only. Matches are
+    yielded in the order routes were mapped, so first-match-wins semantics
+    (and RoutePassed fall-through) stay the same as with linear scan.
+
+    When route hits and overlapping route pairs (see RouteAnalyzer) are
+    given, hot routes are moved towards the front of their buckets, but
+    never in front of an earlier route they may overlap with. reorder()
+    applies current hits, only buckets whose order changed are recompiled.
+    """
+
+    def __init__(self, routes, hits=None, overlapping_pairs=None):
+        self._hits = hits
+        self._later_overlaps = None
+        if hits is not None and overlapping_pairs is not None:
+            self._later_overlaps = {}
+            for first, second in overlapping_pairs:
+                self._later_overlaps.setdefault(first, []).append(second)
+
+        self._static = {}
+        self._static_methods = {}
+        regex_routes = {}
+        for position, route in enumerate(routes):
+            for method in route.get_methods():
+                if route.is_regex():
+                    regex_routes.setdefault(method, []).append(
+                        (position, route)
+                    )
+                else:
+                    self._static.setdefault(
+                        (method, route.pattern), []
+                    ).append((position, route))
+                    self._static_methods.setdefault(
+                        route.pattern, set()
+                    ).add(method)
+
+        self._combined = {}
+        self._segments = {}
+        for entries in regex_routes.itervalues():
+            for unused_, route in entries:
+                if id(route) not in self._segments:
+                    self._segments[id(route)] = _route_segment(route)
+                    self._combined[id(route)] = CombinedMatcher.combinable(
+                        route
+                    )
+
+        self._regex_routes = regex_routes
+        self._buckets = {}
+        self._regex = self._build_regex()
+        log.debug(
+            "Route index built: %d static keys, %d regex buckets",
+            len(self._static),
+            sum(
+                len(buckets) + 1
+                for buckets, unused_
+                in self._regex.itervalues()
+            )
+        )
+
+    def allowed_methods(self, uri):
+        """
+        Returns set of methods of routes matching uri
+        """
+        allowed = set(self._static_methods.get(uri, ()))
+        for method, (buckets, wildcard) in self._regex.iteritems():
+            if method not in allowed:
+                bucket = buckets.get(uri_segment(uri), wildcard)
+                if any(
+                    route.convert_params(route_params) is not None
+                    for unused_, route, route_params
+                    in bucket.group_matches(uri)
+                ):
+                    allowed.add(method)
+
+        return allowed
+
+    def group_matches(self, method, uri):
+        """
+        Yields (route, route_params) for every route matching method and
+        uri, params are not converted and routes whose params can't be
+        converted are included
+        """
+        static = iter(self._static.get((method, uri), ()))
+        next_static = next(static, None)
+        try:
+            buckets, wildcard = self._regex[method]
+        except KeyError:
+            regex_matches = ()
+        else:
+            regex_matches = buckets.get(
+                uri_segment(uri), wildcard
+            ).group_matches(uri)
+
+        for position, route, route_params in regex_matches:
+            while next_static is not None and next_static[0] < position:
+                yield next_static[1], {}
+                next_static = next(static, None)
+
+            yield route, route_params
+
+        while next_static is not None:
+            yield next_static[1], {}
+            next_static = next(static, None)
+
+    def matches(self, method, uri):
+        """
+        Yields (route, route_params) for every route matching method and uri
+        """
+        for route, route_params in self.group_matches(method, uri):
+            route_params = route.convert_params(route_params)
+            if route_params is not None:
+                yield route, route_params
+
+    def reorder(self):
+        """
+        Moves hot routes forward by current hits
+        """
+        if self._later_overlaps is None:
+            return
+
+        self._regex = self._build_regex()
+        log.debug("Routes reordered by hits")
+
+    def _bucket(self, entries, buckets):
+        # bucket of unchanged order is reused, its regexes stay compiled
+        key = tuple(position for position, unused_ in entries)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = RegexBucket(entries, self._combined)
+
+        buckets[key] = bucket
+        return bucket
+
+    def _build_buckets(self, entries, buckets):
+        exact = {}
+        shared = []
+        for entry in entries:
+            segment, complete = self._segments[id(entry[1])]
+            if complete:
+                exact.setdefault(segment, []).append(entry)
+            else:
+                shared.append((segment, entry))
+
+        segment_buckets = {
+            segment: self._bucket(
+                self._hot_first(sorted(
+                    bucket_entries + [
+                        entry
+                        for prefix, entry
+                        in shared
+                        if segment.startswith(prefix)
+                    ],
+                    key=lambda entry: entry[0]
+                )),
+                buckets
+            )
+            for segment, bucket_entries
+            in exact.iteritems()
+        }
+        wildcard = self._bucket(
+            self._hot_first([entry for unused_, entry in shared]), buckets
+        )
+        return segment_buckets, wildcard
+
+    def _build_regex(self):
+        buckets = {}
+        regex = {
+            method: self._build_buckets(entries, buckets)
+            for method, entries
+            in self._regex_routes.iteritems()
+        }
+        self._buckets = buckets
+        return regex
+
+    def _hot_first(self, entries):
+        """
+        Topologically sorts entries so that overlapping routes keep their
+        order, prefers routes with more hits among the rest
+        """
+        if self._later_overlaps is None or len(entries) < 2:
+            return entries
+
+        by_position = dict(entries)
+        blockers = dict.fromkeys(by_position, 0)
+        unblocks = {}
+        for position in by_position:
+            for later in self._later_overlaps.get(position, ()):
+                if later in by_position:
+                    blockers[later] += 1
+                    unblocks.setdefault(position, []).append(later)
+
+        ready = [
+            (-self._hits.get(route, 0), position)
+            for position, route
+            in entries
+            if not blockers[position]
+        ]
+        heapify(ready)
+        ordered = []
+        while ready:
+            unused_, position = heappop(ready)
+            ordered.append((position, by_position[position]))
+            for later in unblocks.get(position, ()):
+                blockers[later] -= 1
+                if not blockers[later]:
+                    heappush(ready, (
+                        -self._hits.get(by_position[later], 0), later
+                    ))
+
+        return ordered
+
+
+def _has_group_reference(pattern):
+    try:
+        parsed = sre_parse.parse(pattern)
+    except (re_error, sre_constants.error):
+        return True
+
+    return _contains_op(parsed, (
+        sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS
+    ))
+
+
+def _contains_op(parsed, ops):
+    for op, value in parsed:
+        if op in ops:
+            return True
+
+        for item in (value if isinstance(value, (list, tuple)) else (value,)):
+            if isinstance(item, sre_parse.SubPattern):
+                if _contains_op(item, ops):
+                    return True
+            elif isinstance(item, (list, tuple)):
+                for sub in item:
+                    if (
+                        isinstance(sub, sre_parse.SubPattern) and
+                        _contains_op(sub, ops)
+                    ):
+                        return True
+
+    return False
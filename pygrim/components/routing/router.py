@@ -1,8 +1,11 @@
 # coding: utf8
 
 from .abstract_router import AbstractRouter
+from .analysis import RouteAnalyzer
 from .exceptions import RouteAlreadyExists, RouteNotRegistered
 from .route import Route, RouteGroup
+from .route_index import RouteIndex
+from ..utils import LruCache
 from logging import getLogger
 from re import compile as re_compile
 
@@ -12,14 +15,151 @@ log = getLogger("pygrim.components.router")
 class Router(AbstractRouter):
 
     def __init__(self):
+        self._analyzer = None
+        self._hits = None
+        self._index = None
+        self._match_cache = None
         self._named_routes = None
+        self._reorder_interval = 0
+        self._requests = 0
+        self._url_memo = None
         self._routes = []
         self._route_groups = []
 
+    def after_request(self):
+        """
+        Reorders routes by hits every pygrim:route_reorder_interval requests,
+        called once response is sent
+        """
+        if self._reorder_interval > 0 and self._index is not None:
+            self._requests += 1
+            if not self._requests % self._reorder_interval:
+                self._index.reorder()
+
+    def allowed_methods(self, uri):
+        allowed = (
+            set(
+                method
+                for route in self._routes
+                if route.match_uri(uri) is not None
+                for method in route.get_methods()
+            )
+            if self._index is None
+            else self._index.allowed_methods(uri)
+        )
+        # HEAD requests are dispatched as GET
+        if "GET" in allowed:
+            allowed.add("HEAD")
+
+        return allowed
+
+    def configure(self, config):
+        cache_size = config.getint("pygrim:route_cache_size", 0)
+        self._match_cache = LruCache(cache_size) if cache_size > 0 else None
+        self._url_memo = (
+            {}
+            if config.getbool("pygrim:url_for_memo", False)
+            else None
+        )
+        self._reorder_interval = config.getint(
+            "pygrim:route_reorder_interval", 0
+        )
+        # hits are counted for stats route and for reordering
+        self._hits = (
+            {}
+            if (
+                self._reorder_interval > 0 or
+                config.get("pygrim:route_stats", None)
+            )
+            else None
+        )
+
+    def finalize(self):
+        # static route has no params, its converters would be ignored
+        static_converted = [
+            route.pattern
+            for route
+            in self._routes
+            if route.has_converters() and not route.is_regex()
+        ]
+        if static_converted:
+            raise RuntimeError(
+                "Converters given for static routes %r" % static_converted
+            )
+
+        # analysis is needed for reordering, stats compute it on demand
+        self._analyzer = (
+            RouteAnalyzer(self._routes)
+            if self._reorder_interval > 0
+            else None
+        )
+        self._index = self._build_index()
+        if self._match_cache is not None:
+            self._match_cache.clear()
+
+    def get_match_cache_stats(self):
+        return (
+            None
+            if self._match_cache is None
+            else self._match_cache.stats()
+        )
+
+    def get_route_stats(self):
+        """
+        Returns route hits and results of static route analysis
+        """
+        if self._analyzer is None:
+            self._analyzer = RouteAnalyzer(self._routes)
+
+        analyzer = self._analyzer
+        hits = self._hits or {}
+        return {
+            "hits": sorted(
+                (
+                    dict(self._describe_route(route), hits=hits.get(route, 0))
+                    for route
+                    in self._routes
+                ),
+                key=lambda route: route["hits"],
+                reverse=True
+            ),
+            "match_cache": self.get_match_cache_stats(),
+            "overlapping": [
+                [
+                    self._describe_route(self._routes[first]),
+                    self._describe_route(self._routes[second])
+                ]
+                for first, second
+                in analyzer.overlapping_pairs()
+            ],
+            "shadowed": [
+                {
+                    "route": self._describe_route(self._routes[shadowed]),
+                    "shadowed_by": self._describe_route(
+                        self._routes[shadowing]
+                    )
+                }
+                for shadowed, shadowing
+                in analyzer.shadowed_routes()
+            ]
+        }
+
     def get_routes(self):
         return self._routes
 
+    def load_routes(self, routes):
+        """
+        Appends already mapped routes, e.g. ones loaded from snapshot
+        """
+        self._analyzer = None
+        self._index = None
+        self._named_routes = None
+        self._routes.extend(routes)
+
     def map(self, route):
+        # routes mapped after finalization would be missing in index
+        self._analyzer = None
+        self._index = None
         if isinstance(route, Route):
             full_pattern = self._join(
                 self._group_pattern(), route.pattern.strip("/")
@@ -40,10 +180,26 @@ class Router(AbstractRouter):
             raise ValueError("Unknown type: %s to map" % (type(route),))
 
     def matching_routes(self, context):
-        for route in self._routes:
-            if route.matches(context):
-                context.current_route = route
-                yield route
+        # routes are matched once per request, memo lives until next one
+        if self._url_memo:
+            self._url_memo.clear()
+
+        method = context.get_request_method()
+        uri = context.get_request_uri()
+        if self._index is None:
+            matches = self._scan_routes(method, uri)
+        elif self._match_cache is None:
+            matches = self._index.matches(method, uri)
+        else:
+            matches = self._cached_matches(method, uri)
+
+        for route, route_params in matches:
+            if self._hits is not None:
+                self._hits[route] = self._hits.get(route, 0) + 1
+
+            context.set_route_params(route_params)
+            context.current_route = route
+            yield route
         else:
             context.current_route = None
 
@@ -57,8 +213,75 @@ class Router(AbstractRouter):
         self._route_groups.append(group)
 
     def url_for(self, route_name, params):
-        route = self._get_named_route(route_name)
-        return route.url_for(params)
+        """
+        With pygrim:url_for_memo urls are memoized until router matches
+        next request. Urls built outside of request dispatch (postfork,
+        background jobs) stay memoized until then as well.
+        """
+        if self._url_memo is None:
+            return self._get_named_route(route_name).url_for(params)
+
+        try:
+            # 1, 1.0 and True are equal keys, but give different urls
+            key = (route_name, frozenset(
+                (param, type(value), value)
+                for param, value
+                in params.iteritems()
+            ))
+            url = self._url_memo.get(key)
+        except TypeError:
+            # unhashable param values
+            return self._get_named_route(route_name).url_for(params)
+
+        if url is None:
+            url = self._get_named_route(route_name).url_for(params)
+            self._url_memo[key] = url
+
+        return url
+
+    def url_for_many(self, requests):
+        """
+        Returns list of urls for iterable of (route_name, params) pairs
+        """
+        return [
+            self.url_for(route_name, params)
+            for route_name, params
+            in requests
+        ]
+
+    def _build_index(self):
+        if self._reorder_interval > 0:
+            return RouteIndex(
+                self._routes, self._hits, self._analyzer.overlapping_pairs()
+            )
+
+        return RouteIndex(self._routes)
+
+    def _cached_matches(self, method, uri):
+        # whole candidate list is cached to keep RoutePassed fall-through,
+        # params are cached as matched and converted on every hit, so that
+        # converted values are not shared among requests
+        key = (method, uri)
+        matches = self._match_cache.get(key)
+        if matches is None:
+            matches = tuple(self._index.group_matches(method, uri))
+            self._match_cache.set(key, matches)
+
+        converted = []
+        for route, route_params in matches:
+            route_params = route.convert_params(dict(route_params))
+            if route_params is not None:
+                converted.append((route, route_params))
+
+        return converted
+
+    def _describe_route(self, route):
+        return {
+            "handle": route.get_handle_name(),
+            "methods": list(route.get_methods()),
+            "name": route.get_name(),
+            "pattern": route.pattern
+        }
 
     def _get_named_route(self, name):
         if not self._has_named_route(name):
@@ -100,6 +323,13 @@ class Router(AbstractRouter):
             in self._route_groups
         )
 
+    def _scan_routes(self, method, uri):
+        for route in self._routes:
+            if method in route.get_methods():
+                route_params = route.match_uri(uri)
+                if route_params is not None:
+                    yield route, route_params
+
     def _join(self, *args):
         return "".join(
             part if part.lstrip("(").startswith("/") else "/" + part
@@ -0,0 +1,110 @@
+# coding: utf8
+
+from .converters import CONVERTERS, register_converter, resolve_converter
+from .exceptions import UnknownConverter
+from hashlib import md5
+from inspect import getsourcefile
+from logging import getLogger
+from os import chmod, path, remove, rename
+from tempfile import NamedTemporaryFile
+
+import cPickle as pickle
+
+log = getLogger("pygrim.components.route_snapshot")
+
+# raise whenever pickled route layout changes
+SNAPSHOT_FORMAT = 3
+ROUTING_SOURCES = ("converters.py", "route.py", "router.py")
+
+
+def routes_version(register_func):
+    """
+    Returns version of routes registered by register_func, computed
+    from sources of its module and pygrim routing, or None when
+    sources are not available.
+    """
+    sources = [getsourcefile(register_func)]
+    sources.extend(
+        path.join(path.dirname(path.abspath(__file__)), source)
+        for source
+        in ROUTING_SOURCES
+    )
+    version = md5(str(SNAPSHOT_FORMAT))
+    try:
+        for source in sources:
+            with open(source, "rb") as source_in:
+                version.update(source_in.read())
+    except (IOError, TypeError):
+        log.warning("Can't compute routes version from %r", sources)
+        return None
+
+    return version.hexdigest()
+
+
+def load_route_snapshot(snapshot_path, version):
+    """
+    Returns routes stored in snapshot, None when snapshot is missing,
+    broken or of another version. Named converters stored with routes
+    are registered unless registered already.
+    """
+    try:
+        with open(snapshot_path, "rb") as snapshot_in:
+            snapshot_version, converters = pickle.load(snapshot_in)
+            if snapshot_version != version:
+                log.info(
+                    "Route snapshot %r is outdated, discarding", snapshot_path
+                )
+                return None
+
+            for name, converter in converters.iteritems():
+                if name not in CONVERTERS:
+                    register_converter(name, converter)
+
+            routes = pickle.load(snapshot_in)
+    except IOError:
+        log.debug("Route snapshot %r not found", snapshot_path)
+        return None
+    except UnknownConverter:
+        raise
+    except Exception:
+        log.exception("Broken route snapshot %r", snapshot_path)
+        return None
+
+    log.debug("Loaded %d routes from snapshot %r", len(routes), snapshot_path)
+    return routes
+
+
+def save_route_snapshot(snapshot_path, version, routes):
+    routes = list(routes)
+    # converters registered by routes module may not be registered yet
+    # when workers load routes, so they are stored (and loaded) first
+    converters = {
+        name: resolve_converter(name)
+        for route in routes
+        for name in route.get_converter_names()
+    }
+    # other workers may be reading the snapshot, replace it atomically
+    try:
+        snapshot_out = NamedTemporaryFile(
+            dir=path.dirname(path.abspath(snapshot_path)), delete=False
+        )
+    except (IOError, OSError):
+        log.exception("Can't save route snapshot %r", snapshot_path)
+        return False
+
+    try:
+        with snapshot_out:
+            pickle.dump(
+                (version, converters), snapshot_out, pickle.HIGHEST_PROTOCOL
+            )
+            pickle.dump(routes, snapshot_out, pickle.HIGHEST_PROTOCOL)
+        # temporary file is private, workers may run as another user
+        chmod(snapshot_out.name, 0644)
+        rename(snapshot_out.name, snapshot_path)
+    except (IOError, OSError, pickle.PicklingError, TypeError):
+        log.exception("Can't save route snapshot %r", snapshot_path)
+        remove(snapshot_out.name)
+        return False
+
+    log.debug("Saved %d routes to snapshot %r", len(routes), snapshot_path)
+    return True
@@ -62,11 +62,19 @@ class RedisSessionStorage(RedisSessionStorageBase):
 
     def __init__(self, config):
         super(RedisSessionStorage, self).__init__(config)
-        self.redis = connect_redis(config, section="session:args:")
+        self.reconnect()
+
+    def reconnect(self):
+        self.redis = connect_redis(self._config, section="session:args:")
 
 
 class RedisSentinelSessionStorage(RedisSessionStorageBase):
 
     def __init__(self, config):
         super(RedisSentinelSessionStorage, self).__init__(config)
-        self.redis = connect_redis_sentinel(config, section="session:args:")
+        self.reconnect()
+
+    def reconnect(self):
+        self.redis = connect_redis_sentinel(
+            self._config, section="session:args:"
+        )
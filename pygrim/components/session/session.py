@@ -6,6 +6,8 @@ log = getLogger("pygrim.session.session")
 
 class Session(dict):
 
+    __slots__ = ("_id", "_new")
+
     def __init__(self, session_id, content, new_session):
         self._id = session_id
         self._new = new_session
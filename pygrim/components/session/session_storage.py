@@ -33,6 +33,13 @@ class SessionStorage(object):
     def load(self, request):
         raise NotImplementedError()
 
+    def reconnect(self):
+        """
+        Reopens connections, called in worker when server was preloaded
+        in uwsgi master
+        """
+        pass
+
     def save(self, session):
         raise NotImplementedError()
 
@@ -6,4 +6,6 @@ from .functions import ensure_string, ensure_tuple  # noqa
 from .functions import fix_trailing_slash, remove_trailing_slash    # noqa
 from .functions import get_class_name, get_instance_name, get_method_name   # noqa
 from .functions import is_regex # noqa
+from .lru_cache import LruCache # noqa
+from .prefix_trie import PrefixTrie # noqa
 from . import json2 # noqa
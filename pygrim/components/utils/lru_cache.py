@@ -0,0 +1,46 @@
+# coding: utf8
+
+from collections import OrderedDict
+
+
+class LruCache(object):
+    """
+    Bounded mapping dropping least recently used items, counts hits/misses
+    """
+
+    def __init__(self, size):
+        self._items = OrderedDict()
+        self._size = size
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def clear(self):
+        self._items.clear()
+
+    def get(self, key, default=None):
+        try:
+            value = self._items.pop(key)
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._items[key] = value
+        return value
+
+    def set(self, key, value):
+        self._items.pop(key, None)
+        self._items[key] = value
+        while len(self._items) > self._size:
+            self._items.popitem(last=False)
+
+    def stats(self):
+        return {
+            "capacity": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._items)
+        }
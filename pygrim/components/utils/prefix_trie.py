@@ -0,0 +1,74 @@
+# coding: utf8
+
+
+class _Node(object):
+
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        # first char of edge label -> (edge label, child node)
+        self.children = {}
+        self.values = []
+
+
+class PrefixTrie(object):
+    """
+    Radix tree mapping string prefixes to values. Finds values of all
+    prefixes of given text in one walk.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+
+    def add(self, prefix, value):
+        node = self._root
+        pos = 0
+        while pos < len(prefix):
+            try:
+                label, child = node.children[prefix[pos]]
+            except KeyError:
+                child = _Node()
+                node.children[prefix[pos]] = (prefix[pos:], child)
+                node = child
+                break
+
+            common = 0
+            rest = len(prefix) - pos
+            while (
+                common < len(label) and
+                common < rest and
+                label[common] == prefix[pos + common]
+            ):
+                common += 1
+
+            if common < len(label):
+                split = _Node()
+                split.children[label[common]] = (label[common:], child)
+                node.children[prefix[pos]] = (label[:common], split)
+                child = split
+
+            node = child
+            pos += common
+
+        node.values.append(value)
+
+    def prefixes_of(self, text):
+        """
+        Returns values of all prefixes text starts with, shortest first
+        """
+        node = self._root
+        found = list(node.values)
+        pos = 0
+        while pos < len(text):
+            try:
+                label, node = node.children[text[pos]]
+            except KeyError:
+                break
+
+            if not text.startswith(label, pos):
+                break
+
+            pos += len(label)
+            found.extend(node.values)
+
+        return found
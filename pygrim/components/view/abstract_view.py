@@ -17,6 +17,10 @@ class AbstractView(object):
         """Returns directory in which templates are searched"""
         raise NotImplementedError()
 
+    def preload(self):
+        """Prepares fork-safe state (compiled templates) in uwsgi master"""
+        pass
+
     def render(self, context):
         """
         Renders a template. Template's path and data are taken from context
@@ -1,15 +1,19 @@
 # coding: utf8
 
+from logging import getLogger
 from os import getcwd, path
 import traceback
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import TemplateError
 
 from .base_view import BaseView
 from ..utils.json2 import dumps as json_dumps
 
 I18N_EXT_NAME = "pygrim.components.jinja_ext.i18n.I18NExtension"
 
+log = getLogger("pygrim.components.view.jinja_view")
+
 
 def _suppress_none(self, variable):
     return (
@@ -34,6 +38,9 @@ class JinjaView(BaseView):
         super(JinjaView, self).__init__(config, **kwargs)
         self._debug = config.getbool("jinja:debug", False)
         self._dump_switch = config.get("jinja:dump_switch", "jkxd")
+        self._preload_extensions = config.get(
+            "jinja:preload_extensions", ("jinja",)
+        )
         self._env = ConfigurableEnvironment(
             config=config,
             extensions=self._get_extensions(config),
@@ -67,6 +74,28 @@ class JinjaView(BaseView):
     def get_template_directory(self):
         return self._env.loader.searchpath
 
+    def preload(self):
+        """
+        Compiles templates (files with jinja:preload_extensions) into
+        environment cache, as many as it holds
+        """
+        templates = self._env.list_templates(
+            extensions=self._preload_extensions
+        )
+        cache = self._env.cache
+        if cache is not None and hasattr(cache, "capacity"):
+            templates = templates[:cache.capacity]
+        elif cache is None:
+            templates = ()
+
+        for template in templates:
+            try:
+                self._env.get_template(template)
+            except (TemplateError, UnicodeDecodeError):
+                log.warning("Template %r not preloaded.", template)
+
+        log.debug("Preloaded %d templates.", len(templates))
+
     def render(self, context):
         if not context.template:
             raise RuntimeError(
@@ -109,15 +138,15 @@ class JinjaView(BaseView):
             result = self._handle_dump(context)
         else:
             template = self._env.get_template(context.template)
-            context.view_data.update({
-                "context": context
-            })
+            # context kept in view data would be reference cycle (garbage)
+            # of every rendered request, template gets it aside
+            data = dict(context.view_data, context=context)
             if context.disable_content_length:
-                stream = template.stream(**context.view_data)
+                stream = template.stream(data)
                 stream.enable_buffering(30)
                 result = (part for part in stream)
             else:
-                result = template.render(**context.view_data)
+                result = template.render(data)
 
             if context.session is not None:
                 context.session.del_flashes()
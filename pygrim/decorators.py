@@ -1,7 +1,8 @@
 # coding: utf8
 
 from __future__ import print_function
-from functools import wraps
+from functools import update_wrapper, wraps
+from components.routing import DispatchFinished, DispatchResult
 from components.utils import json2 as json
 from copy import deepcopy
 
@@ -39,6 +40,9 @@ class BaseDecorator(object):
             ret = func(*args, **kwargs)
             return self.post_call(func, args, kwargs, ret)
 
+        # wraps copies attributes of inner wrapper, layer is valid only
+        # when it names the wrapper itself
+        wrapper._decorator_layer = (self, func, wrapper)
         return wrapper
 
     def _expose(self, func):
@@ -53,6 +57,109 @@ class BaseDecorator(object):
             func._exposed = True
 
 
+def flatten_decorators(func):
+    """
+    Returns function calling pre_call/post_call hooks of BaseDecorator
+    layers wrapping func in one loop instead of nested wrappers. Layers
+    without overridden hooks are skipped, args and kwargs are copied
+    whenever nested wrappers would make the copy observable. Returns func
+    when there is nothing to flatten.
+    """
+    layers = []
+    current = func
+    while True:
+        layer = getattr(current, "_decorator_layer", None)
+        if layer is None or layer[2] is not current:
+            break
+
+        layers.append(layer[:2])
+        current = layer[1]
+
+    if len(layers) < 2:
+        return func
+
+    innermost = current
+    hooks = tuple(
+        (
+            fun,
+            _overridden_hook(decorator, "pre_call"),
+            _overridden_hook(decorator, "post_call")
+        )
+        for decorator, fun
+        in layers
+        if (
+            _overridden_hook(decorator, "pre_call") or
+            _overridden_hook(decorator, "post_call")
+        )
+    )
+
+    def pipeline(*args, **kwargs):
+        args = list(args)
+        calls = []
+        for fun, pre_call, post_call in hooks:
+            # copies are visible only to post_call of outer layers
+            if calls:
+                args = list(args)
+                kwargs = dict(kwargs)
+
+            if pre_call:
+                pre_call(fun, args, kwargs)
+
+            if post_call:
+                calls.append((fun, post_call, args, kwargs))
+
+        ret = innermost(*args, **kwargs)
+        for fun, post_call, args, kwargs in reversed(calls):
+            ret = post_call(fun, args, kwargs, ret)
+
+        return ret
+
+    return update_wrapper(pipeline, func)
+
+
+def _overridden_hook(decorator, name):
+    hook = getattr(decorator, name)
+    return (
+        None
+        if hook.im_func is getattr(BaseDecorator, name).im_func
+        else hook
+    )
+
+
+class conditional(BaseDecorator):
+    """
+    Answers conditional GET with 304 Not Modified before decorated method
+    (and template render) runs. etag and last_modified are cheap
+    validators called with arguments of decorated method, they return
+    entity tag (version, hash of data keys) and datetime or timestamp of
+    last modification, or None when unknown.
+    """
+
+    def __init__(self, etag=None, last_modified=None):
+        if etag is None and last_modified is None:
+            raise RuntimeError("conditional needs etag or last_modified")
+
+        self._etag = etag
+        self._last_modified = last_modified
+        super(conditional, self).__init__()
+
+    def pre_call(self, fun, args, kwargs):
+        context = kwargs.get("context")
+        if context.set_validators(
+            etag=self._etag(*args, **kwargs) if self._etag else None,
+            last_modified=(
+                self._last_modified(*args, **kwargs)
+                if self._last_modified
+                else None
+            )
+        ):
+            # body of 304 is dropped by Response.finalize
+            context.set_response_status(304)
+            raise DispatchFinished()
+
+        return super(conditional, self).pre_call(fun, args, kwargs)
+
+
 class force_content_length(BaseDecorator):
     """
     Forces method to send Content-Length response header even if server
@@ -162,7 +269,7 @@ class json_method(method):
 
     def post_call(self, fun, args, kwargs, res):
         context = kwargs.get("context")
-        if context:
+        if context and not isinstance(res, DispatchResult):
             json_res = json.dumps(res)
             context.set_response_body(json_res)
             context.set_response_content_type('application/json')
@@ -181,11 +288,17 @@ class template_display(BaseDecorator):
         super(template_display, self).__init__(*args, **kwargs)
 
     def post_call(self, fun, args, kwargs, res):
+        if isinstance(res, DispatchResult):
+            return res
+
         context = kwargs.get("context")
         context.view_data.update(res.get("data") or {})
         context.template = res.get("_template", self._template)
-        args[0].display(context)
-        return super(template_display, self).post_call(fun, args, kwargs, res)
+        # display raises DispatchFinished, or returns FINISHED with
+        # pygrim:dispatch_results enabled
+        return super(template_display, self).post_call(
+            fun, args, kwargs, args[0].display(context)
+        )
 
 
 class template_method(template_display, method):
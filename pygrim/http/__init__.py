@@ -1,5 +1,8 @@
 # coding: utf8
 
+from .compression import Compression
 from .context import Context
+from .context_pool import ContextPool
+from .offload import FileOffload
 from .request import Request
 from .response import Response
@@ -0,0 +1,141 @@
+# coding: utf8
+
+from .conditional import encoded_etag
+from .offload import OFFLOAD_HEADERS
+from .response import NO_CONTENT_STATUSES
+
+from logging import getLogger
+import zlib
+
+log = getLogger("pygrim.http.compression")
+
+# preferred first when client accepts them equally
+ENCODINGS = ("gzip", "deflate")
+
+DEFAULT_TYPES = (
+    "application/javascript", "application/json", "application/xml",
+    "image/svg+xml", "text/css", "text/html", "text/javascript",
+    "text/plain", "text/xml"
+)
+
+
+class Compression(object):
+    """
+    Compresses response bodies with encoding negotiated from
+    Accept-Encoding. Buffered bodies shorter than min_size are sent as they
+    are, generator bodies are compressed incrementally and flushed whenever
+    flush_size bytes of input were compressed since last flush, so that
+    client gets streamed response progressively.
+    """
+
+    def __init__(self, level=6, min_size=1024, types=None, flush_size=4096):
+        self._flush_size = flush_size
+        self._level = level
+        self._min_size = min_size
+        self._types = frozenset(
+            content_type.lower()
+            for content_type
+            in (types or DEFAULT_TYPES)
+        )
+
+    def compress(self, response, accept_encoding):
+        """
+        Compresses body of response (with headers still in dict) and
+        updates its headers. Response without content (304) only gets
+        headers of compressed representation it stands for.
+        """
+        headers = response.headers
+        content_type = headers.get("Content-Type", "")
+        if (
+            content_type.split(";", 1)[0].strip().lower() not in self._types or
+            response.is_file or
+            "Content-Encoding" in headers or
+            "Content-Range" in headers or
+            any(header in headers for header in OFFLOAD_HEADERS)
+        ):
+            return
+
+        self._add_vary(headers)
+        encoding = self.negotiate(accept_encoding)
+        if encoding is None:
+            return
+
+        if response.status in NO_CONTENT_STATUSES:
+            if "ETag" in headers:
+                headers["ETag"] = encoded_etag(headers["ETag"], encoding)
+
+            return
+        elif response.is_generator:
+            response.body = self._compress_stream(response.body, encoding)
+        elif len(response.body) >= self._min_size:
+            compressor = self._compressor(encoding)
+            response.body = (
+                compressor.compress(response.body) + compressor.flush()
+            )
+        else:
+            return
+
+        headers["Content-Encoding"] = encoding
+        if "ETag" in headers:
+            headers["ETag"] = encoded_etag(headers["ETag"], encoding)
+
+    def negotiate(self, accept_encoding):
+        """
+        Returns best encoding acceptable by client, None for identity
+        """
+        if not accept_encoding:
+            return None
+
+        qualities = {}
+        for item in accept_encoding.split(","):
+            coding, unused_, params = item.partition(";")
+            quality = 1.0
+            for param in params.split(";"):
+                name, unused_, value = param.partition("=")
+                if name.strip().lower() == "q":
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+
+            qualities[coding.strip().lower()] = quality
+
+        best, best_quality = None, 0.0
+        for encoding in ENCODINGS:
+            quality = qualities.get(encoding, qualities.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+
+        return best
+
+    def _add_vary(self, headers):
+        vary = headers.get("Vary")
+        if not vary:
+            headers["Vary"] = "Accept-Encoding"
+        elif "accept-encoding" not in (
+            part.strip().lower() for part in vary.split(",")
+        ):
+            headers["Vary"] = "%s, Accept-Encoding" % vary
+
+    def _compress_stream(self, parts, encoding):
+        compressor = self._compressor(encoding)
+        pending = 0
+        for part in parts:
+            data = compressor.compress(part)
+            pending += len(part)
+            if pending >= self._flush_size:
+                data += compressor.flush(zlib.Z_SYNC_FLUSH)
+                pending = 0
+
+            if data:
+                yield data
+
+        yield compressor.flush()
+
+    def _compressor(self, encoding):
+        # gzip container is selected by window bits, deflate means zlib one
+        return (
+            zlib.compressobj(self._level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            if encoding == "gzip"
+            else zlib.compressobj(self._level)
+        )
@@ -0,0 +1,99 @@
+# coding: utf8
+
+from calendar import timegm
+from datetime import datetime
+from email.utils import formatdate, mktime_tz, parsedate_tz
+from logging import getLogger
+
+log = getLogger("pygrim.http.conditional")
+
+# compressed representations get their own entity tags
+ENCODING_SUFFIXES = ('-gzip"', '-deflate"')
+
+
+def format_etag(value, weak=False):
+    """
+    Returns value as quoted entity tag, quoted values are kept
+    """
+    value = str(value)
+    if value.startswith(('"', 'W/"')):
+        return value
+
+    return '%s"%s"' % ("W/" if weak else "", value.replace('"', ""))
+
+
+def encoded_etag(etag, encoding):
+    """
+    Returns entity tag of representation compressed with encoding
+    """
+    return '%s-%s"' % (etag[:-1], encoding)
+
+
+def etag_matches(etag, if_none_match):
+    """
+    Weak comparison of etag with If-None-Match header value, tags of
+    compressed representations match tag of their body
+    """
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = _opaque_tag(etag)
+    return any(
+        _opaque_tag(candidate.strip()) == opaque
+        for candidate
+        in if_none_match.split(",")
+    )
+
+
+def http_date(value):
+    """
+    Returns HTTP-date of timestamp or datetime (naive one is taken as UTC)
+    """
+    if isinstance(value, datetime):
+        value = timegm(value.utctimetuple())
+
+    return formatdate(value, usegmt=True)
+
+
+def is_not_modified(environment, etag=None, last_modified=None):
+    """
+    Evaluates If-None-Match and If-Modified-Since of request against
+    response validators, If-None-Match takes precedence
+    """
+    if_none_match = environment.get_header("if_none_match")
+    if if_none_match is not None:
+        return etag is not None and etag_matches(etag, if_none_match)
+
+    if_modified_since = environment.get_header("if_modified_since")
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    since = parse_http_date(if_modified_since)
+    if isinstance(last_modified, datetime):
+        last_modified = timegm(last_modified.utctimetuple())
+
+    # HTTP-date has second precision
+    return since is not None and int(last_modified) <= since
+
+
+def parse_http_date(value):
+    """
+    Returns timestamp of HTTP-date, None when value is not valid date
+    """
+    parsed = parsedate_tz(value)
+    if parsed is None:
+        log.debug("Invalid HTTP-date %r", value)
+        return None
+
+    return mktime_tz(parsed)
+
+
+def _opaque_tag(etag):
+    if etag.startswith("W/"):
+        etag = etag[2:]
+
+    for suffix in ENCODING_SUFFIXES:
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+
+    return etag
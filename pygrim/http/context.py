@@ -2,6 +2,7 @@
 
 from json import dumps as json_dumps
 
+from .conditional import format_etag, http_date, is_not_modified
 from .grim_dicts import ImmutableDict
 from ..components.formater import Formater
 from ..components.jinja_ext.i18n import I18NExtension, Undefined
@@ -17,20 +18,45 @@ log = getLogger("pygrim.http.context")
 
 class Context(object):
 
+    # attributes computed on first use by given initializer, cheap requests
+    # (json, redirects, status) mostly do not need them at all
+    LAZY_ATTRIBUTES = {
+        "_acceptance_is_set": "_initialize_acceptances",
+        "_auto_etag": "_initialize_settings",
+        "_enabled_acceptances": "_initialize_acceptances",
+        "_debug_languages": "_initialize_languages",
+        "_default_language": "_initialize_languages",
+        "_force_https": "_initialize_settings",
+        "_head_skip_body": "_initialize_settings",
+        "_lang_key": "_initialize_languages",
+        "_lang_switch": "_initialize_settings",
+        "_language": "_initialize_languages",
+        "_language_map": "_initialize_languages",
+        "_languages": "_initialize_languages",
+        "_suppress_port": "_initialize_settings",
+        "disable_content_length": "_initialize_settings",
+        "formater": "_initialize_formater"
+    }
+
+    # no __dict__, applications storing their own attributes in context
+    # set context class (subclass without __slots__ gets __dict__)
+    __slots__ = tuple(LAZY_ATTRIBUTES) + (
+        "_debug", "_default_headers", "_file_offload", "_formater_locale",
+        "_request", "_response", "_route_params", "_session_loaded",
+        "canonical_args", "config", "current_route", "session", "template",
+        "view_data"
+    )
+
     def __init__(
-        self, environment, config, request_class, response_class, debug=False
+        self, environment, config, request_class, response_class, debug=False,
+        file_offload=None
     ):
         self._debug = debug
         self.canonical_args = None
-        self.formater = None
         self.config = config
-        self._suppress_port = config.getbool("context:suppress_port", False)
-        self._force_https = config.getbool("context:force_https", False)
         self._default_headers = config.get("context:default_headers", None)
-        self._lang_switch = config.get("pygrim:i18n:locale_switch", "lang")
+        self._file_offload = file_offload
 
-        self.disable_content_length = config.get(
-            "view:disable_content_length", False)
         self.current_route = None
         self.session = None
         self.template = None
@@ -38,19 +64,6 @@ class Context(object):
 
         self._request = request_class(environment)
 
-        self._enabled_acceptances = {"function"}
-        cookie_acceptance = self.get_cookie("cookie_accept")
-        self._acceptance_is_set = bool(cookie_acceptance)
-        if cookie_acceptance:
-            self._enabled_acceptances |= set(
-                {
-                    "P": "preference",
-                    "A": "analytics",
-                    "M": "marketing",
-                    "F": "function"
-                }.get(k, "function") for k in cookie_acceptance
-            )
-
         self._response = response_class()
         if self._default_headers:
             self.add_response_headers(self._default_headers)
@@ -58,16 +71,16 @@ class Context(object):
         self._session_loaded = False
         self.set_route_params()
 
-        self._default_language = 'cs_CZ.UTF8'
-        self._language = self._default_language
-        self._lang_key = None
-        self._languages = (self._default_language,)
-        self._debug_languages = ()
-        self._language_map = {}
-        if self.config.get("pygrim:i18n", False):
-            self._initialize_localization()
-        if not self.formater:
-            self.formater = Formater(self.get_language())
+    def __getattr__(self, attr):
+        try:
+            initializer = self.LAZY_ATTRIBUTES[attr]
+        except KeyError:
+            raise AttributeError("%r object has no attribute %r" % (
+                self.__class__.__name__, attr
+            ))
+
+        getattr(self, initializer)()
+        return object.__getattribute__(self, attr)
 
     def DELETE(self, key=None, fallback=None):
         return self._request_param("DELETE", key, fallback)
@@ -98,6 +111,7 @@ class Context(object):
         Sets cookie with specified name, value, domain, path, etc.,
         for a lifetime relative to utcnow()
         """
+        self._negotiate_before_cookie(name)
         self._response.cookies[name] = {
             "domain": domain,
             "http_only": http_only,
@@ -131,6 +145,7 @@ class Context(object):
         self, name, domain=None, path=None, http_only=None, secure=None,
         same_site=None
     ):
+        self._negotiate_before_cookie(name)
         if name in self._response.cookies:
             self._response.cookies[name].update({
                 "lifetime": -1,
@@ -166,8 +181,57 @@ class Context(object):
             "cookies": self._request.cookies
         })
 
-    def finalize_response(self):
-        self._response.finalize()
+    def finalize_response(self, compression=None):
+        # language negotiation may set language cookie
+        if (
+            self._localization_pending() and
+            self.is_cookie_acceptance_enabled("preference")
+        ):
+            self._initialize_languages()
+
+        finalize_kwargs = {}
+        # HEAD gets the same headers as GET
+        if self._auto_etag and (
+            self.is_request_get() or self.is_request_head()
+        ):
+            finalize_kwargs.update((
+                ("auto_etag", True),
+                ("if_none_match", self._request.environment.get_header(
+                    "if_none_match"
+                ))
+            ))
+
+        if compression is not None:
+            finalize_kwargs.update((
+                ("compression", compression),
+                ("accept_encoding", self._request.environment.get_header(
+                    "accept_encoding"
+                ))
+            ))
+
+        self._response.finalize(**finalize_kwargs)
+
+    def reuse(
+        self, environment, config, request_class, response_class, debug=False,
+        file_offload=None
+    ):
+        """
+        Initializes context for another request
+        """
+        # other attributes are set again by __init__
+        for attr in self.LAZY_ATTRIBUTES:
+            try:
+                delattr(self, attr)
+            except AttributeError:
+                pass
+
+        self._formater_locale = None
+        if hasattr(self, "__dict__"):
+            self.__dict__.clear()
+        self.__init__(
+            environment, config, request_class, response_class, debug=debug,
+            file_offload=file_offload
+        )
 
     def generates_response(self):
         return (
@@ -262,6 +326,9 @@ class Context(object):
             self._response.status, http_responses[self._response.status]
         )
 
+    def is_file_response(self):
+        return self._response.is_file
+
     def is_generator_function(self):
         return self._response.is_generator_function
 
@@ -318,6 +385,21 @@ class Context(object):
             )
         # endif
 
+    def offload_file(self, file_path, content_type=None, filename=None):
+        """
+        Lets front server send file (pygrim:offload:header), response
+        gets only the header and empty body. Files are mapped to internal
+        locations by pygrim:offload:locations and uwsgi:static-map.
+        Content-Disposition is set when filename is given.
+        """
+        if self._file_offload is None:
+            raise RuntimeError("File offload is not available.")
+
+        self._file_offload.apply(
+            self._response, file_path, content_type=content_type,
+            filename=filename
+        )
+
     def pop_route_params(self):
         params = self._route_params.copy()
         self.set_route_params()
@@ -341,10 +423,11 @@ class Context(object):
         debug = debug or self._debug
         language = self._language_map.get(language)
         if language in self._languages:
-            if self.formater:
-                self.formater._set_locale(language)
+            formater = self._peek("formater")
+            if formater:
+                formater._set_locale(language)
             else:
-                self.formater = Formater(language)
+                self._formater_locale = language
             self._language = language
             if with_cookie:
                 # lang cookie is not nesessary to be secured => same_site=None
@@ -374,33 +457,167 @@ class Context(object):
     def set_response_content_type(self, content_type):
         self._response.headers["Content-Type"] = content_type
 
+    def set_response_file(self, source):
+        """
+        Sets file (object or path) as response body, wsgi server sends it
+        (with sendfile where available) without reading it to memory
+        """
+        self._response.body = (
+            open(source, "rb")
+            if isinstance(source, basestring)
+            else source
+        )
+
     def set_response_status(self, status):
         self._response.status = status
 
     def set_route_params(self, params=None):
         self._route_params = ImmutableDict(params or {})
 
-    def _initialize_localization(self):
-        self._default_language = self.config.get("pygrim:i18n:default_locale")
-        self._lang_key = self.config.get(
-            "pygrim:i18n:cookie_key", "site_language"
-        )
-        self._languages = self.config.get("pygrim:i18n:locales")
-        self._debug_languages = (
-            self.config.get("pygrim:i18n:debug_locales", None) or ()
+    def set_validators(self, etag=None, last_modified=None):
+        """
+        Sets ETag and Last-Modified response headers, returns True when
+        client's cached copy is still valid (GET and HEAD requests only)
+        """
+        if etag is not None:
+            etag = format_etag(etag)
+            self._response.headers["ETag"] = etag
+
+        if last_modified is not None:
+            self._response.headers["Last-Modified"] = http_date(last_modified)
+
+        return self.is_request_get() and is_not_modified(
+            self._request.environment, etag, last_modified
         )
-        self._language_map = {
+
+    def skips_body(self):
+        """
+        Returns True when body generator is not run for HEAD request
+        (pygrim:head_skip_body), buffered body is still produced so that
+        headers (ETag, Content-Length, compression) match GET
+        """
+        return self._head_skip_body and self.is_request_head()
+
+    def _initialize_acceptances(self):
+        enabled_acceptances = {"function"}
+        cookie_acceptance = self.get_cookie("cookie_accept")
+        if cookie_acceptance:
+            enabled_acceptances |= set(
+                {
+                    "P": "preference",
+                    "A": "analytics",
+                    "M": "marketing",
+                    "F": "function"
+                }.get(k, "function") for k in cookie_acceptance
+            )
+
+        self._initialize_lazy((
+            ("_acceptance_is_set", bool(cookie_acceptance)),
+            ("_enabled_acceptances", enabled_acceptances)
+        ))
+
+    def _initialize_formater(self):
+        # language is negotiated first, it may choose formater locale
+        language = self.get_language()
+        self.formater = Formater(self._peek("_formater_locale") or language)
+
+    def _initialize_languages(self):
+        if self.config.get("pygrim:i18n", False):
+            self._initialize_localization()
+            return
+
+        default_language = 'cs_CZ.UTF8'
+        self._initialize_lazy((
+            ("_debug_languages", ()),
+            ("_default_language", default_language),
+            ("_lang_key", None),
+            ("_language", default_language),
+            ("_language_map", {}),
+            ("_languages", (default_language,))
+        ))
+
+    def _initialize_lazy(self, values):
+        """
+        Sets (attribute, value) pairs, attributes assigned before their
+        initializer ran (e.g. by handler) keep their values
+        """
+        for attr, value in values:
+            try:
+                object.__getattribute__(self, attr)
+            except AttributeError:
+                setattr(self, attr, value)
+
+    def _initialize_localization(self):
+        default_language = self.config.get("pygrim:i18n:default_locale")
+        languages = self.config.get("pygrim:i18n:locales")
+        language_map = {
             lang: lang
             for lang
-            in self._languages
+            in languages
         }
-        self._language_map.update(
-            self.config.get("pygrim:i18n:locale_map", {})
-        )
-        self._language = self._select_language(
-            with_cookie=self.is_cookie_acceptance_enabled("preference")
+        language_map.update(self.config.get("pygrim:i18n:locale_map", {}))
+        negotiate = self._peek("_language") is None
+        self._initialize_lazy((
+            ("_debug_languages", (
+                self.config.get("pygrim:i18n:debug_locales", None) or ()
+            )),
+            ("_default_language", default_language),
+            ("_lang_key", self.config.get(
+                "pygrim:i18n:cookie_key", "site_language"
+            )),
+            # negotiation is not pending any more while it runs
+            ("_language", default_language),
+            ("_language_map", language_map),
+            ("_languages", languages)
+        ))
+        if negotiate:
+            self._language = self._select_language(
+                with_cookie=self.is_cookie_acceptance_enabled("preference")
+            )
+
+    def _initialize_settings(self):
+        self._initialize_lazy((
+            ("_auto_etag", self.config.getbool("context:auto_etag", False)),
+            ("_force_https", self.config.getbool(
+                "context:force_https", False
+            )),
+            ("_head_skip_body", self.config.getbool(
+                "pygrim:head_skip_body", False
+            )),
+            ("_lang_switch", self.config.get(
+                "pygrim:i18n:locale_switch", "lang"
+            )),
+            ("_suppress_port", self.config.getbool(
+                "context:suppress_port", False
+            )),
+            ("disable_content_length", self.config.get(
+                "view:disable_content_length", False
+            ))
+        ))
+
+    def _localization_pending(self):
+        return (
+            self._peek("_language") is None and
+            self.config.get("pygrim:i18n", False)
         )
 
+    def _negotiate_before_cookie(self, name):
+        # language cookie set by negotiation has to be overwritten by later
+        # changes as if negotiation ran before dispatch
+        if self._localization_pending() and name == self.config.get(
+            "pygrim:i18n:cookie_key", "site_language"
+        ):
+            self._initialize_languages()
+
+    def _peek(self, attr):
+        """
+        Returns attribute value or None, lazy attribute is not initialized
+        """
+        try:
+            return object.__getattribute__(self, attr)
+        except AttributeError:
+            return None
+
     def _request_param(self, method, key=None, fallback=None):
         try:
             value = (
@@ -0,0 +1,33 @@
+# coding: utf8
+
+from logging import getLogger
+
+log = getLogger("pygrim.http.context_pool")
+
+
+class ContextPool(object):
+    """
+    Per-worker pool of contexts reused for subsequent requests. Context must
+    not be referenced after its response is sent, e.g. from threads.
+    """
+
+    def __init__(self, size):
+        self._free = []
+        self._size = size
+
+    def acquire(self, context_class, *args, **kwargs):
+        try:
+            context = self._free.pop()
+        except IndexError:
+            return context_class(*args, **kwargs)
+
+        if type(context) is not context_class:
+            log.debug("Dropping pooled context of %r", type(context))
+            return context_class(*args, **kwargs)
+
+        context.reuse(*args, **kwargs)
+        return context
+
+    def release(self, context):
+        if len(self._free) < self._size:
+            self._free.append(context)
@@ -1,12 +1,37 @@
 # coding: utf8
 
+from collections import Mapping
 from logging import getLogger
 
 log = getLogger("pygrim.http.grim_dicts")
 
+# lookup keys are mostly constants in code, their normalization is cached
+MAX_NORMALIZED_KEYS = 1024
+_normalized_keys = {}
+
+
+def normalize_key(key):
+    try:
+        return _normalized_keys[key]
+    except (KeyError, TypeError):
+        pass
+
+    normalized = key.lower()
+    if normalized.startswith("http_"):
+        normalized = normalized[5:]
+    elif normalized.startswith("x_"):
+        normalized = normalized[2:]
+
+    if len(_normalized_keys) < MAX_NORMALIZED_KEYS:
+        _normalized_keys[key] = normalized
+
+    return normalized
+
 
 class ImmutableDict(dict):
 
+    __slots__ = ()
+
     def __hash__(self):
         return id(self)
 
@@ -24,6 +49,8 @@ class ImmutableDict(dict):
 
 class NormalizedImmutableDict(ImmutableDict):
 
+    __slots__ = ()
+
     def __init__(self, container=None):
         super(NormalizedImmutableDict, self).__init__({
             self._normalize_key(key): container[key]
@@ -45,10 +72,111 @@ class NormalizedImmutableDict(ImmutableDict):
         )
 
     def _normalize_key(self, key):
-        normalized = key.lower().replace("-", "-")
-        if normalized.startswith("http_"):
-            normalized = normalized[5:]
-        elif normalized.startswith("x_"):
-            normalized = normalized[2:]
+        return normalize_key(key)
+
+
+class EnvironmentView(Mapping):
+    """
+    Read-only view of wsgi environment with keys normalized the way
+    NormalizedImmutableDict does it. Environment is not copied: index of
+    normalized keys (of all entries and of headers) is built in one pass
+    on first lookup that needs it. Computed values override environment
+    entries, resolvers are called with the view on first access and their
+    results are kept as computed values.
+    """
+
+    __slots__ = (
+        "_computed", "_environment", "_header_index", "_index", "_resolvers"
+    )
+
+    def __init__(self, environment, computed=None, resolvers=None):
+        self._computed = computed or {}
+        self._environment = environment
+        self._header_index = None
+        self._index = None
+        self._resolvers = resolvers or {}
+
+    def __contains__(self, key):
+        key = normalize_key(key)
+        return (
+            key in self._computed or
+            key in self._resolvers or
+            key in self._get_index()
+        )
+
+    def __getitem__(self, key):
+        """
+        raises KeyError when normalized key is not found
+        """
+        key = normalize_key(key)
+        try:
+            return self._computed[key]
+        except KeyError:
+            pass
+
+        try:
+            resolver = self._resolvers[key]
+        except KeyError:
+            return self._environment[self._get_index()[key]]
+
+        value = self._computed[key] = resolver(self)
+        return value
+
+    def __hash__(self):
+        return id(self)
+
+    def __iter__(self):
+        keys = set(self._computed)
+        keys.update(self._resolvers)
+        keys.update(self._get_index())
+        return iter(keys)
+
+    def __len__(self):
+        return sum(1 for unused_ in self)
+
+    def copy(self):
+        return dict(self.iteritems())
+
+    def get_header(self, key, default=None):
+        """
+        Returns value of header (HTTP_* or X_* environment entry)
+        """
+        if self._header_index is None:
+            self._build_index()
+
+        try:
+            return self._environment[self._header_index[normalize_key(key)]]
+        except KeyError:
+            return default
+
+    def raw(self, key):
+        """
+        Returns environment entry under exact (not normalized) key,
+        raises KeyError when there is none
+        """
+        return self._environment[key]
+
+    def _build_index(self):
+        # later keys win, as with NormalizedImmutableDict
+        index = {}
+        header_index = {}
+        for key in self._environment:
+            upper_key = key.upper()
+            normalized = key.lower()
+            if upper_key.startswith("HTTP_"):
+                normalized = normalized[5:]
+                header_index[normalized] = key
+            elif upper_key.startswith("X_"):
+                normalized = normalized[2:]
+                header_index[normalized] = key
+
+            index[normalized] = key
+
+        self._index = index
+        self._header_index = header_index
+
+    def _get_index(self):
+        if self._index is None:
+            self._build_index()
 
-        return normalized
+        return self._index
@@ -0,0 +1,119 @@
+# coding: utf8
+
+from logging import getLogger
+from mimetypes import guess_type
+from os import path
+from re import compile as re_compile
+from urllib import quote
+
+log = getLogger("pygrim.http.offload")
+
+OFFLOAD_HEADERS = ("X-Accel-Redirect", "X-Sendfile")
+CONTROL_CHARACTERS_REGEXP = re_compile(u"[\x00-\x1f\x7f-\x9f]")
+
+
+def content_disposition(filename, disposition="attachment"):
+    """
+    Returns Content-Disposition value with filename, names which are not
+    plain ascii are sent in filename* parameter with ascii fallback.
+    Control characters are dropped, filename may come from user data.
+    """
+    if isinstance(filename, str):
+        filename = filename.decode("utf-8")
+
+    filename = CONTROL_CHARACTERS_REGEXP.sub(u"", filename)
+    fallback = filename.encode("ascii", "replace")
+    for char in ('"', "\\"):
+        fallback = fallback.replace(char, "_")
+
+    value = '%s; filename="%s"' % (disposition, fallback)
+    if fallback.decode("ascii") != filename:
+        value += "; filename*=UTF-8''%s" % quote(
+            filename.encode("utf-8"), safe=""
+        )
+
+    return value
+
+
+def parse_locations(mappings):
+    """
+    Returns (uri prefix, directory) pairs of 'uri=directory' mappings
+    """
+    locations = []
+    for mapping in mappings:
+        if "=" not in mapping:
+            raise RuntimeError("Invalid offload location: %r." % mapping)
+
+        locations.append(tuple(
+            part.strip() for part in mapping.split("=", 1)
+        ))
+
+    return locations
+
+
+class FileOffload(object):
+    """
+    Lets front server send files, handler only authorizes download.
+    X-Accel-Redirect (nginx) - file path is mapped to uri of internal
+                               location by its directory
+    X-Sendfile (apache, lighttpd) - absolute file path is sent, file must
+                                    be in one of locations (if any)
+    """
+
+    def __init__(self, header="X-Accel-Redirect", locations=()):
+        if header not in OFFLOAD_HEADERS:
+            raise RuntimeError("Unknown offload header: %r." % header)
+
+        self._header = header
+        # (directory, uri prefix), most specific directory first
+        self._locations = sorted(
+            (
+                (
+                    path.normpath(directory).rstrip("/") + "/",
+                    prefix.rstrip("/") + "/"
+                )
+                for prefix, directory
+                in locations
+            ),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+
+    def apply(self, response, file_path, content_type=None, filename=None):
+        response.headers[self._header] = self.target(file_path)
+        response.headers["Content-Type"] = (
+            content_type or
+            guess_type(filename or file_path)[0] or
+            "application/octet-stream"
+        )
+        if filename:
+            response.headers["Content-Disposition"] = content_disposition(
+                filename
+            )
+
+        response.body = ""
+
+    def target(self, file_path):
+        """
+        Returns header value for file_path, raises RuntimeError when
+        file is not in any offload location
+        """
+        if isinstance(file_path, unicode):
+            file_path = file_path.encode("utf-8")
+
+        file_path = path.normpath(path.abspath(file_path))
+        # X-Sendfile is restricted to locations only when there are some
+        if self._header == "X-Sendfile" and not self._locations:
+            return file_path
+
+        for directory, prefix in self._locations:
+            if file_path.startswith(directory):
+                return (
+                    file_path
+                    if self._header == "X-Sendfile"
+                    else quote(prefix + file_path[len(directory):])
+                )
+
+        raise RuntimeError(
+            "File %r is not in any offload location." % file_path
+        )
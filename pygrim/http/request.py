@@ -1,6 +1,6 @@
 # coding: utf8
 
-from .grim_dicts import ImmutableDict, NormalizedImmutableDict
+from .grim_dicts import EnvironmentView, ImmutableDict
 from logging import getLogger
 from re import compile as re_compile, IGNORECASE as re_IGNORECASE
 from string import strip as string_strip
@@ -23,10 +23,14 @@ class Request(object):
         "REMOTE_ADDR"
     )
 
+    # params are parsed lazily in __getattr__
+    __slots__ = (
+        "DELETE", "GET", "JSON", "POST", "PUT", "RAW_POST", "content_type",
+        "cookies", "environment"
+    )
+
     def __init__(self, environment):
-        self._parse_headers(environment)
         self._save_environment(environment)
-        self.cookies = self._parse_cookies(self._headers.get("cookie", ""))
 
     def _parse_cookies(self, source):
         if not source:
@@ -67,7 +71,7 @@ class Request(object):
 
     def _get_content_type(self):
         c_t = self._normalize_content_type(
-            self._headers.get("content_type")
+            self.environment.get_header("content_type")
         )
         if not c_t:
             # fallback for some special cases when content type is not present
@@ -105,6 +109,10 @@ class Request(object):
                 data = {}
         elif attr == 'content_type':
             data = self._get_content_type()
+        elif attr == "cookies":
+            data = self._parse_cookies(
+                self.environment.get_header("cookie", "")
+            )
         else:
             raise AttributeError("%r object has no attribute %r" % (
                 self.__class__.__name__, attr
@@ -125,23 +133,25 @@ class Request(object):
             c_t = c_t.split(";", 1)[0].strip().lower()
         return c_t or None
 
-    def _get_host(self, env):
-        try:
-            matches = self.HOST_REGEXP.match(self._headers["host"])
-        except KeyError:
-            host = env["SERVER_NAME"]
+    @classmethod
+    def _get_host(cls, environment):
+        host_header = environment.get_header("host")
+        if host_header is None:
+            host = environment.raw("SERVER_NAME")
         else:
+            matches = cls.HOST_REGEXP.match(host_header)
             if matches:
                 host = matches.groups()[1]
             else:
-                host = self._headers["host"].split(":")[0]
+                host = host_header.split(":")[0]
 
         return host
 
-    def _get_ip(self, env):
-        for key in self.IP_KEYS:
+    @classmethod
+    def _get_ip(cls, environment):
+        for key in cls.IP_KEYS:
             try:
-                ip = env[key].split(",")[0].strip()
+                ip = environment.raw(key).split(",")[0].strip()
                 break
             except KeyError:
                 pass
@@ -150,23 +160,12 @@ class Request(object):
 
         return ip
 
-    def _get_port(self, env):
+    @classmethod
+    def _get_port(cls, environment):
         try:
-            return int(env["SERVER_PORT"])
+            return int(environment.raw("SERVER_PORT"))
         except:
-            return self.DEFAULT_SCHEME_PORTS[env["wsgi.url_scheme"]]
-
-    def _parse_headers(self, environment):
-        headers = {}
-        for key in environment.keys():
-            upper_key = key.upper()
-            if (
-                upper_key.startswith("X_") or
-                upper_key.startswith("HTTP_")
-            ):
-                headers[key] = environment.get(key)
-
-        self._headers = NormalizedImmutableDict(headers)
+            return cls.DEFAULT_SCHEME_PORTS[environment.raw("wsgi.url_scheme")]
 
     def _parse_string(self, source, pairs_separator="&"):
         if not source:
@@ -194,14 +193,19 @@ class Request(object):
         return ImmutableDict(parsed)
 
     def _save_environment(self, env):
-        method = env.pop("REQUEST_METHOD").upper()
+        # environ is wrapped, not copied, values derived from it are kept
+        # aside and take precedence over raw environ keys; resolvers must not
+        # reference request, it would make reference cycle
+        method = env["REQUEST_METHOD"].upper()
+        computed = {}
         if method == "HEAD":
-            env["original_request_method"] = method
+            computed["original_request_method"] = method
             method = "GET"
 
-        env["host"] = self._get_host(env)
-        env["ip"] = self._get_ip(env)
-        env["path_info"] = env.pop("PATH_INFO").rstrip("/") or "/"
-        env["request_method"] = method
-        env["server_port"] = self._get_port(env)
-        self.environment = NormalizedImmutableDict(env)
+        computed["path_info"] = env["PATH_INFO"].rstrip("/") or "/"
+        computed["request_method"] = method
+        self.environment = EnvironmentView(env, computed, {
+            "host": self._get_host,
+            "ip": self._get_ip,
+            "server_port": self._get_port
+        })
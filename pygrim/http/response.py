@@ -1,8 +1,12 @@
 # coding: utf8
 
+from .conditional import etag_matches, format_etag
+
 from datetime import datetime, timedelta
+from hashlib import md5
 from inspect import isgeneratorfunction
 from logging import getLogger
+from os import fstat
 # from os import SEEK_END
 from urllib import quote_plus as url_quoteplus
 import types
@@ -97,6 +101,11 @@ class Response(object):
         lambda c: "Secure" if c.get("secure") else None,
     )
 
+    __slots__ = (
+        "_body", "cookies", "headers", "is_file", "is_generator",
+        "is_generator_function", "status"
+    )
+
     def __init__(self):
         self._body = ""
         self.cookies = {}
@@ -104,6 +113,7 @@ class Response(object):
             "Content-Type": "text/html"
         }
         self.status = 200
+        self.is_file = False
         self.is_generator = False
         self.is_generator_function = False
 
@@ -113,6 +123,10 @@ class Response(object):
 
     @body.setter
     def body(self, body):
+        if self.is_file and body is not self._body:
+            self._body.close()
+
+        is_file = False
         is_generator = False
         if body is None:
             body = ""
@@ -127,23 +141,61 @@ class Response(object):
             body = (ensure_string(part) for part in body())
             is_generator = True
         else:
+            try:
+                # real files are sent by wsgi server, not read to memory
+                size = fstat(body.fileno()).st_size
+            except (AttributeError, IOError, OSError, ValueError):
+                size = None
+
             try:
                 body.seek(0)
-                body = body.read()
+                if size is None:
+                    body = body.read()
+                else:
+                    is_file = True
             except AttributeError:
                 body = ""
                 log.critical("Cannot read value from given body content!")
                 log.exception("Cannot read value from given body content!")
 
-        if body and not is_generator:
+        if is_file:
+            self.headers["Content-Length"] = size
+        elif body and not is_generator:
             self.headers["Content-Length"] = len(body)
         else:
             self.headers.pop("Content-Length", None)
 
+        self.is_file = is_file
         self.is_generator = is_generator
         self._body = body
 
-    def finalize(self):
+    def finalize(
+        self, auto_etag=False, if_none_match=None, compression=None,
+        accept_encoding=None
+    ):
+        """
+        auto_etag sets ETag as hash of buffered body of 200 response
+        (unless handler set one), matching If-None-Match makes it 304.
+        compression (Compression) compresses body by accept_encoding.
+        """
+        if (
+            auto_etag and
+            self.status == 200 and
+            self._body and
+            not self.is_file and
+            not self.is_generator and
+            "ETag" not in self.headers
+        ):
+            etag = format_etag(md5(self._body).hexdigest())
+            self.headers["ETag"] = etag
+            if if_none_match is not None and etag_matches(
+                etag, if_none_match
+            ):
+                self.status = 304
+
+        if compression is not None:
+            compression.compress(self, accept_encoding)
+
         if self.status in NO_CONTENT_STATUSES:
             self.body = None
 
@@ -3,22 +3,31 @@ from .components.config import AbstractConfig, YamlConfig
 from .components.exceptions import (
     WrongConfigBase, WrongRouterBase, WrongSessionHandlerBase, WrongViewBase
 )
+from .components.gc_policy import GcPolicy
 from .components.log import initialize_loggers
 from .components.routing import AbstractRouter, Route, Router
 from .components.routing import (
     DispatchFinished, MissingRouteHandle, RouteNotRegistered, RoutePassed
 )
+from .components.routing import FINISHED, PASSED, REDIRECT
+from .components.routing import (
+    load_route_snapshot, routes_version, save_route_snapshot
+)
 from .components.session import (
     DummySession, FileSessionStorage, RedisSessionStorage,
     RedisSentinelSessionStorage, SessionStorage
 )
 from .components.utils import ensure_tuple, get_class_name, get_method_name
+from .components.utils import PrefixTrie
 from .components.utils import remove_trailing_slash
 from .components.view import AbstractView, DummyView, JinjaView
-from .decorators import method
-from .http import Context, Request, Response
+from .decorators import flatten_decorators, method
+from .http import (
+    Compression, Context, ContextPool, FileOffload, Request, Response
+)
+from .http.offload import parse_locations
 
-from inspect import getmembers, ismethod, getmro
+from inspect import getmro, isfunction
 from jinja2 import escape, Markup
 from json import dumps as json_dumps
 from locale import LC_ALL, setlocale
@@ -26,14 +35,31 @@ from logging import getLogger
 from os import path
 from string import strip as string_strip
 from sys import exc_info
+from types import MethodType
+from wsgiref.util import FileWrapper
+import gc
 try:
     from uwsgi import opt as uwsgi_opt
 except ImportError:
     uwsgi_opt = {}
 
+try:
+    from compatibility import http_responses
+except ImportError:
+    from .http.codes import http_responses
+
 
 log = getLogger("pygrim.server")
 
+# block size of file bodies when wsgi server can not use sendfile
+FILE_BLOCK_SIZE = 64 * 1024
+
+STATUS_ALIVE = {
+    "status": 200,
+    "status_message": "OK",
+    "system_alive": 1
+}
+
 
 def register_view_class(name, cls):
     if name in Server.KNOWN_VIEW_CLASSES:
@@ -55,11 +81,11 @@ class ResponseWrap(object):
 
     def __call__(self, status, headers):
         log.debug("starting response with:%r:%r", status, headers)
-        self._start_response(status, headers)
-        self._start_response = self.noop
-
-    def noop(self, status, headers):
-        pass
+        # response is started only once, bound noop method stored here
+        # would make reference cycle (garbage) of every request
+        if self._start_response is not None:
+            self._start_response(status, headers)
+            self._start_response = None
 
 
 class Server(object):
@@ -87,48 +113,94 @@ class Server(object):
         # self._not_found_methods will be changed to tuple
         # during postfork-time method _collect_exposed_methods
         self._not_found_methods = {}
+        self._not_found_trie = PrefixTrie()
         self._error_method = self._default_error_method
         self._custom_error_handlers = {}
+        # exception class -> custom error handler (or None)
+        self._error_handler_cache = {}
         self._context_class = Context
+        # scanned once (in uwsgi master), workers only bind exposed methods
+        self._exposed_names = self._exposed_method_names()
+        self._pre_context_handlers = []
+        self._preloaded = False
         self._requst_class = Request
         self._response_class = Response
 
     def __call__(self, environment, start_response):
         start_response = ResponseWrap(start_response)
-        context = self._context_class(
-            environment, self.config, self._requst_class, self._response_class,
-            debug=self._debug
+        for handler in self._pre_context_handlers:
+            response = handler(environment)
+            if response is not None:
+                status, headers, body = response
+                start_response(status, list(headers))
+                return (
+                    ()
+                    if environment.get("REQUEST_METHOD", "").upper() == "HEAD"
+                    else (body,)
+                )
+
+        context_args = (
+            environment, self.config, self._requst_class, self._response_class
+        )
+        context = (
+            self._context_class(
+                *context_args, debug=self._debug,
+                file_offload=self._file_offload
+            )
+            if self._context_pool is None
+            else self._context_pool.acquire(
+                self._context_class, *context_args, debug=self._debug,
+                file_offload=self._file_offload
+            )
         )
         try:
             self._handle_request(context=context)
         except:
             log.exception("Fatal Error")
+            self._finish_request(context)
             start_response("500: Fatal Server Error", [])
-            yield "Fatal Server Error"
-        else:
-            context.finalize_response()
+            return ("Fatal Server Error",)
+
+        try:
+            if self._compression is None:
+                context.finalize_response()
+            else:
+                context.finalize_response(compression=self._compression)
+
             start_response(
                 context.get_response_status_code(),
                 context.get_response_headers()
             )
+            parts = (
+                self._file_parts(environment, context)
+                if context.is_file_response()
+                else None
+            )
+        except:
+            self._finish_request(context)
+            raise
 
-            # to keep errors and other cases iteration should stay where it is
-            body = context.get_response_body()
-            if context.generates_response():
-                do_yield = not context.is_request_head()
-                parts = body() if context.is_generator_function() else body
-                for part in parts:
-                    if do_yield:
-                        yield part
-            elif context.is_request_head():
-                log.debug("HEAD - not returning body")
-            else:
-                yield body
-            # endif
-        return
+        if parts is None:
+            return self._response_parts(context)
+
+        # file is sent by wsgi server, context is not needed any more
+        self._finish_request(context)
+        return parts
+
+    def add_pre_context_handler(self, handler):
+        """
+        Registers handler called with raw wsgi environment before context
+        is created. Handler returns None to let request go on, or
+        (status, headers, body) to answer it without context, routing and
+        session. Handlers are called in order of registration.
+        """
+        self._pre_context_handlers.append(handler)
 
     def display(self, *args, **kwargs):
         self.view.display(*args, **kwargs)
+        if self._dispatch_results:
+            return FINISHED
+
         raise DispatchFinished()
 
     def get_config_dir(self):
@@ -153,23 +225,43 @@ class Server(object):
             raise RuntimeError("Redirect needs 'url' or 'route_name' param.")
 
         context.redirect(url, **kwargs)
+        if self._dispatch_results:
+            return REDIRECT
+
         raise DispatchFinished()
 
     def do_postfork(self):
         """
         This method needs to be called in uwsgi postfork
         """
-        self._collect_exposed_methods()
-        if hasattr(self, "_route_register_func"):
-            self._route_register_func(self.router)
-            self._finalize_routes()
-            log.debug("Routes loaded")
+        self._gc_policy.start()
+        if self._preloaded:
+            self.session_handler.reconnect()
+            log.debug("Connections reopened in preloaded worker")
         else:
-            log.warning("There is no function to register routes!")
+            self._prepare_dispatch()
 
         if hasattr(self, "postfork"):
             self.postfork()
 
+    def preload(self):
+        """
+        Does fork-safe part of postfork (exposed methods, routes, compiled
+        templates) once in uwsgi master, workers share it copy-on-write.
+        do_postfork then only reopens connections in workers.
+        """
+        self._prepare_dispatch()
+        self.view.preload()
+        self._preloaded = True
+        # workers do not inherit garbage; frozen objects are never
+        # traversed by collections in workers (python 3.7+ only)
+        gc.collect()
+        freeze = getattr(gc, "freeze", None)
+        if freeze is not None:
+            freeze()
+
+        log.debug("Server preloaded")
+
     def render(self, *args, **kwargs):
         log.warning(
             "STOP CALLING AWFUL %r, CALL %r INSTEAD!",
@@ -177,6 +269,28 @@ class Server(object):
         )
         return self.display(*args, **kwargs)
 
+    def save_route_snapshot(self):
+        """
+        Registers routes into fresh router and saves them to snapshot
+        configured in pygrim:route_snapshot. Meant to be called once in uwsgi
+        master or at deploy time, workers then only load the snapshot.
+        """
+        snapshot_path = self.config.get("pygrim:route_snapshot", None)
+        if not snapshot_path:
+            raise RuntimeError("pygrim:route_snapshot is not configured!")
+
+        if not hasattr(self, "_route_register_func"):
+            raise RuntimeError("There is no function to register routes!")
+
+        router = self._find_router_class()()
+        router.configure(self.config)
+        self._route_register_func(router)
+        return save_route_snapshot(
+            snapshot_path,
+            routes_version(self._route_register_func),
+            router.get_routes()
+        )
+
     def set_context_class(self, new_class):
         self._set_internal_class("_context_class", new_class, Context)
 
@@ -187,9 +301,10 @@ class Server(object):
         self._set_internal_class("_response_class", new_class, Response)
 
     def _collect_exposed_methods(self):
-        for unused_, member in getmembers(self, predicate=ismethod):
-            if getattr(member, "_exposed", False) is True:
-                self._process_exposed_method(member)
+        for attr_name in self._exposed_names:
+            self._process_exposed_method(
+                self._flatten_method(getattr(self, attr_name))
+            )
 
         if ("", 0) not in self._not_found_methods:
             self._not_found_methods[("", 0)] = self._default_not_found_method
@@ -201,6 +316,12 @@ class Server(object):
         context.set_response_body("Internal Server Error")
         context.set_response_status(500)
 
+    def _default_method_not_allowed(self, context, allowed):
+        context.current_route = None
+        context.set_response_body("Method Not Allowed")
+        context.set_response_status(405)
+        context.add_response_headers({"Allow": ", ".join(sorted(allowed))})
+
     def _default_not_found_method(self, context):
         context.set_response_body("Not found")
         context.set_response_status(404)
@@ -211,6 +332,37 @@ class Server(object):
             context.dump_request()
         )
 
+    def _exposed_method_names(self):
+        """
+        Returns sorted names of exposed methods (route, not-found and error
+        handlers) of server class
+        """
+        # attributes resolved the way getattr does, derived classes win
+        members = {}
+        for klass in reversed(getmro(type(self))):
+            members.update(vars(klass))
+
+        return tuple(sorted(
+            attr_name
+            for attr_name, member
+            in members.iteritems()
+            if (
+                isfunction(member) and
+                getattr(member, "_exposed", False) is True
+            )
+        ))
+
+    def _file_parts(self, environment, context):
+        body = context.get_response_body()
+        if context.is_request_head():
+            log.debug("HEAD - not returning file")
+            body.close()
+            return ()
+
+        # uwsgi file wrapper uses sendfile, wsgiref one reads file in blocks
+        file_wrapper = environment.get("wsgi.file_wrapper", FileWrapper)
+        return file_wrapper(body, FILE_BLOCK_SIZE)
+
     def _finalize_not_found_handlers(self):
         self._not_found_methods = tuple(
             (prefix, priority, self._not_found_methods[(prefix, priority)])
@@ -221,6 +373,11 @@ class Server(object):
                 reverse=True
             )
         )
+        self._not_found_trie = PrefixTrie()
+        for rank, (prefix, priority, handle) in enumerate(
+            self._not_found_methods
+        ):
+            self._not_found_trie.add(prefix, (rank, prefix, priority, handle))
 
     def _finalize_routes(self):
         for route in self.router.get_routes():
@@ -239,6 +396,8 @@ class Server(object):
                     route.pattern
                 )
 
+        self.router.finalize()
+
     def _find_config_class(self):
         for key in self.KNOWN_CONFIG_FORMATS:
             if key in uwsgi_opt:
@@ -250,6 +409,22 @@ class Server(object):
         else:
             raise RuntimeError("No known config format used to start uwsgi!")
 
+    def _find_error_handler(self, exc_class):
+        try:
+            return self._error_handler_cache[exc_class]
+        except KeyError:
+            pass
+
+        handle = None
+        for one in getmro(exc_class):
+            if one in self._custom_error_handlers:
+                log.debug("Found error handler for %r.", one)
+                handle = self._custom_error_handlers[one]
+                break
+
+        self._error_handler_cache[exc_class] = handle
+        return handle
+
     def _find_router_class(self):
         return Router
 
@@ -275,33 +450,64 @@ class Server(object):
 
         return view_class
 
+    def _finish_request(self, context):
+        # response is sent (or connection closed), context is free
+        if self._context_pool is not None:
+            self._context_pool.release(context)
+
+        self.router.after_request()
+        if self._gc_policy.deferred:
+            self._gc_policy.after_request()
+
     def load_session(self, context):
         context.load_session(self.session_handler)
 
     @method(session=False)
     def status_alive(self, context):
         context.set_response_content_type("application/json")
-        context.set_response_body(json_dumps({
-            "status": 200,
-            "status_message": "OK",
-            "system_alive": 1
-        }))
+        context.set_response_body(json_dumps(STATUS_ALIVE))
+
+    @method(session=False)
+    def gc_stats(self, context):
+        context.set_response_content_type("application/json")
+        context.set_response_body(json_dumps(self._gc_policy.get_stats()))
+
+    @method(session=False)
+    def route_stats(self, context):
+        context.set_response_content_type("application/json")
+        context.set_response_body(json_dumps(self.router.get_route_stats()))
+
+    def _flatten_method(self, member):
+        if not self._flatten_decorators:
+            return member
+
+        flat = flatten_decorators(member.im_func)
+        return (
+            member
+            if flat is member.im_func
+            else MethodType(flat, self, type(self))
+        )
 
     def _handle_by_route(self, route, context):
         if route.requires_session():
             self.load_session(context)
 
         try:
-            route.dispatch(context=context)
+            result = route.dispatch(context=context)
         except DispatchFinished:
-            pass
+            result = FINISHED
         except RoutePassed:
             raise
 
+        if result is PASSED:
+            return result
+
         log.debug("Dispatch succeded on: %r.", context.current_route)
         if context.session_loaded():
             context.save_session(self.session_handler)
 
+        return result
+
     def _handle_error(self, context, exc):
         log.exception(
             "Error while dispatching to: %r.",
@@ -312,19 +518,15 @@ class Server(object):
             )
         )
         try:
-
-            for one in getmro(exc.__class__):
-                log.debug("Looking up error handler for %r.", one)
-                if one in self._custom_error_handlers:
-                    log.debug("Found error handler for %r.", one)
-                    handle = self._custom_error_handlers[one]
-                    try:
-                        handle(context=context, exc=exc)
-                    except DispatchFinished:
-                        pass
-                    if getattr(handle, "_save_session", False):
-                        context.save_session(self.session_handler)
-                    raise DispatchFinished()
+            handle = self._find_error_handler(exc.__class__)
+            if handle is not None:
+                try:
+                    handle(context=context, exc=exc)
+                except DispatchFinished:
+                    pass
+                if getattr(handle, "_save_session", False):
+                    context.save_session(self.session_handler)
+                raise DispatchFinished()
             self._error_method(context=context, exc=exc)
             raise DispatchFinished()
         except DispatchFinished:
@@ -355,27 +557,30 @@ class Server(object):
             if request_suffix in self._plain_not_found_suffixes:
                 self._default_not_found_method(context)
             else:
-                for prefix, priority, handle in self._not_found_methods:
-                    if request_uri.startswith(prefix):
+                for unused_, prefix, priority, handle in sorted(
+                    self._not_found_trie.prefixes_of(request_uri)
+                ):
+                    log.debug(
+                        "Using %r %r %r for not_found handling %r",
+                        prefix, priority, handle, request_uri
+                    )
+                    if not context.session and handle._session:
+                        self.load_session(context)
+                    try:
+                        result = handle(context=context)
+                    except RoutePassed:
+                        result = PASSED
+                    except DispatchFinished:
+                        result = FINISHED
+                    if result is PASSED:
                         log.debug(
-                            "Using %r %r %r for not_found handling %r",
+                            "Not used %r %r %r for not_found on %r",
                             prefix, priority, handle, request_uri
                         )
-                        if not context.session and handle._session:
-                            self.load_session(context)
-                        try:
-                            handle(context=context)
-                        except RoutePassed:
-                            log.debug(
-                                "Not used %r %r %r for not_found on %r",
-                                prefix, priority, handle, request_uri
-                            )
-                            continue
-                        except DispatchFinished:
-                            pass
-                        if context.session_loaded():
-                            context.save_session(self.session_handler)
-                        break
+                        continue
+                    if context.session_loaded():
+                        context.save_session(self.session_handler)
+                    break
         except DispatchFinished:
             pass
 
@@ -385,12 +590,28 @@ class Server(object):
         try:
             for route in self.router.matching_routes(context):
                 try:
-                    self._handle_by_route(route=route, context=context)
-                    break
+                    result = self._handle_by_route(
+                        route=route, context=context
+                    )
                 except RoutePassed:
                     continue
+                if result is not PASSED:
+                    break
             else:
-                self._handle_not_found(context=context)
+                allowed = (
+                    self.router.allowed_methods(context.get_request_uri())
+                    if self._method_not_allowed
+                    else ()
+                )
+                if allowed and context.get_request_method() not in allowed:
+                    log.debug(
+                        "Method %r not allowed for %r.",
+                        context.get_request_method(),
+                        context.get_request_uri()
+                    )
+                    self._default_method_not_allowed(context, allowed)
+                else:
+                    self._handle_not_found(context=context)
         except:
             self._handle_error(context=context, exc=exc_info()[1])
 
@@ -446,6 +667,17 @@ class Server(object):
         log.debug("Default translation: %r", default_locale)
         return translations
 
+    def _prepare_dispatch(self):
+        self._collect_exposed_methods()
+        if hasattr(self, "_route_register_func"):
+            self._register_routes()
+            self._finalize_routes()
+            log.debug("Routes loaded")
+        else:
+            log.warning("There is no function to register routes!")
+
+        self._register_fast_paths()
+
     def _process_custom_error_handler(self, method, err_cls):
         if err_cls in self._custom_error_handlers:
             raise RuntimeError(
@@ -454,6 +686,7 @@ class Server(object):
             )
         log.debug("Registered %r to handle %r.", method, err_cls)
         self._custom_error_handlers[err_cls] = method
+        self._error_handler_cache.clear()
 
     def _process_error_handler(self, method):
         log.debug("Method %r registered as default exception handler", method)
@@ -481,12 +714,35 @@ class Server(object):
         log.debug("Method %r registered to handle not-found state", method)
         self._not_found_methods[key] = method
 
+    def _register_routes(self):
+        snapshot_path = self.config.get("pygrim:route_snapshot", None)
+        version = None
+        if snapshot_path:
+            version = routes_version(self._route_register_func)
+            routes = (
+                None
+                if version is None
+                else load_route_snapshot(snapshot_path, version)
+            )
+            if routes is not None:
+                self.router.load_routes(routes)
+                return
+
+        # routes mapped by server itself (status_alive) are not in snapshot
+        premapped = len(self.router.get_routes())
+        self._route_register_func(self.router)
+        if version is not None:
+            save_route_snapshot(
+                snapshot_path, version, self.router.get_routes()[premapped:]
+            )
+
     def _register_router(self):
         router_class = self._find_router_class()
         router = router_class()
         if not isinstance(router, AbstractRouter):
             raise WrongRouterBase(router)
 
+        router.configure(self.config)
         self.router = router
 
     def _register_session_handler(self):
@@ -504,6 +760,92 @@ class Server(object):
     def _register_logger(self, config):
         initialize_loggers(config)
 
+    def _register_fast_paths(self):
+        """
+        Registers pre context handlers answering system_alive and plain
+        not found requests with precomputed responses, unless server
+        customizes their handling
+        """
+        if not self._fast_path or self._context_class is not Context:
+            return
+
+        handlers = []
+        if self._system_alive and self._is_default_method("status_alive"):
+            handlers.append(self._fast_status_alive(self._static_response(
+                200, json_dumps(STATUS_ALIVE), "application/json"
+            )))
+
+        if (
+            self._plain_not_found_suffixes and
+            self._is_default_method("_default_not_found_method")
+        ):
+            handlers.append(self._fast_plain_not_found(
+                self._static_response(404, "Not found")
+            ))
+
+        self._pre_context_handlers[:0] = handlers
+
+    def _fast_plain_not_found(self, response):
+        suffixes = self._plain_not_found_suffixes
+        router = self.router
+
+        def plain_not_found(environment):
+            uri = environment.get("PATH_INFO", "").rstrip("/") or "/"
+            # routes matching uri by any method are left to full dispatch
+            if (
+                path.splitext(uri)[1] in suffixes and
+                not router.allowed_methods(uri)
+            ):
+                return response
+
+        return plain_not_found
+
+    def _fast_status_alive(self, response):
+        system_alive = self._system_alive.rstrip("/") or "/"
+
+        def status_alive(environment):
+            if (
+                environment.get("REQUEST_METHOD", "").upper() in (
+                    "GET", "HEAD", "POST"
+                ) and
+                (environment.get("PATH_INFO", "").rstrip("/") or "/") ==
+                system_alive
+            ):
+                return response
+
+        return status_alive
+
+    def _is_default_method(self, name):
+        return (
+            getattr(type(self), name).im_func is
+            getattr(Server, name).im_func
+        )
+
+    def _static_response(self, status, body, content_type=None):
+        """
+        Returns (status, headers, body) as produced by context
+        """
+        response = self._response_class()
+        default_headers = self.config.get("context:default_headers", None)
+        if default_headers:
+            response.headers.update(
+                (str(key), str(value))
+                for key, value
+                in default_headers.items()
+            )
+
+        if content_type:
+            response.headers["Content-Type"] = content_type
+
+        response.body = body
+        response.status = status
+        response.finalize()
+        return (
+            "%d %s" % (status, http_responses[status]),
+            tuple(response.headers),
+            response.body
+        )
+
     def _register_view(self):
         view_class = self._find_view_class()
 
@@ -514,6 +856,7 @@ class Server(object):
                 "static_file": self._jinja_static_file,
                 "static_file_exists": self._jinja_static_file_exists,
                 "url_for": self._jinja_url_for,
+                "url_for_many": self._jinja_url_for_many,
             }
         }
         if self.config.getboolean("pygrim:i18n", False):
@@ -525,8 +868,69 @@ class Server(object):
 
         self.view = view
 
+    def _response_parts(self, context):
+        try:
+            # to keep errors and other cases iteration should stay
+            # where it is
+            body = context.get_response_body()
+            if context.generates_response() and context.skips_body():
+                log.debug("HEAD - body generator not run")
+            elif context.generates_response():
+                do_yield = not context.is_request_head()
+                parts = (
+                    body()
+                    if context.is_generator_function()
+                    else body
+                )
+                for part in parts:
+                    if do_yield:
+                        yield part
+            elif context.is_request_head():
+                log.debug("HEAD - not returning body")
+            else:
+                yield body
+            # endif
+        finally:
+            self._finish_request(context)
+
     def _setup_env(self):
         self._debug = self.config.getbool("pygrim:debug", True)
+        # display and redirect return FINISHED and REDIRECT instead of
+        # raising DispatchFinished, handlers have to return their result
+        self._dispatch_results = self.config.getbool(
+            "pygrim:dispatch_results", False
+        )
+        self._fast_path = self.config.getbool("pygrim:fast_path", True)
+        self._flatten_decorators = self.config.getbool(
+            "pygrim:flatten_decorators", True
+        )
+        self._compression = (
+            Compression(
+                level=self.config.getint("pygrim:compression:level", 6),
+                min_size=self.config.getint(
+                    "pygrim:compression:min_size", 1024
+                ),
+                types=self.config.get("pygrim:compression:types", None),
+                flush_size=self.config.getint(
+                    "pygrim:compression:flush_size", 4096
+                )
+            )
+            if self.config.getbool("pygrim:compression:enabled", False)
+            else None
+        )
+        self._gc_policy = GcPolicy(
+            self.config.get("pygrim:gc_policy", "default"),
+            self.config.getint("pygrim:gc_full_interval", 1000)
+        )
+        context_pool = self.config.getint("pygrim:context_pool", 0)
+        self._context_pool = (
+            ContextPool(context_pool)
+            if context_pool > 0
+            else None
+        )
+        self._method_not_allowed = self.config.getbool(
+            "pygrim:method_not_allowed", True
+        )
         self._plain_not_found_suffixes = set(
             "." + suffix.lstrip(".")
             for suffix
@@ -542,6 +946,13 @@ class Server(object):
                 if "=" in mapping
             )
         }
+        # static-map serves files as well, front server may offload them
+        self._file_offload = FileOffload(
+            self.config.get("pygrim:offload:header", "X-Accel-Redirect"),
+            parse_locations(ensure_tuple(
+                self.config.get("pygrim:offload:locations", ())
+            )) + self._static_map.items()
+        )
         locale = self.config.get("pygrim:locale", None)
         if locale:
             log.debug("Setting locale 'LC_ALL' to %r", locale)
@@ -559,11 +970,25 @@ class Server(object):
             )
             system_alive = "/system_alive"
 
+        self._system_alive = system_alive
         if system_alive:
             self.router.map(Route(
                 ("GET", "POST"), system_alive, "status_alive"
             ))
 
+        # route stats expose application internals, route is opt-in
+        route_stats = self.config.get("pygrim:route_stats", None)
+        if route_stats:
+            self.router.map(Route(
+                ("GET",), "/" + route_stats.lstrip("/"), "route_stats"
+            ))
+
+        gc_stats = self.config.get("pygrim:gc_stats", None)
+        if gc_stats:
+            self.router.map(Route(
+                ("GET",), "/" + gc_stats.lstrip("/"), "gc_stats"
+            ))
+
     def _set_internal_class(self, attr_name, new_class, required_parent):
         if issubclass(new_class, required_parent):
             setattr(self, attr_name, new_class)
@@ -706,6 +1131,13 @@ class Server(object):
 
         return url
 
+    def _jinja_url_for_many(self, requests):
+        return [
+            self._jinja_url_for(route, params)
+            for route, params
+            in requests
+        ]
+
     def _versioned_file(self, static_file):
         timestamp = (
             None
@@ -82,7 +82,6 @@ class FirstIface(object):
     @not_found_method()
     def not_found(self, context, *args, **kwargs):
         log.debug("Not found...")
-        context.status = 404
         context.template = "404.jinja"
         self.display(context)
 
@@ -0,0 +1,56 @@
+# coding: utf8
+
+"""
+Helpers shared by pygrim tests, run them from repository root:
+    python -m unittest discover -s tests -t .
+"""
+
+from pygrim.components.config import AbstractConfig
+
+
+class DictConfig(AbstractConfig):
+    """
+    Config read from dict instead of yaml file
+    """
+
+    SEPARATOR = ":"
+
+    def _load_config(self, path):
+        # path is config itself
+        return path
+
+
+class FlatConfig(dict):
+    """
+    Flat stand-in for pygrim config, keys are looked up as whole
+    """
+
+    def get(self, key, default=None):
+        return super(FlatConfig, self).get(key, default)
+
+    def getbool(self, key, default=None):
+        return bool(self.get(key, default))
+
+    def getint(self, key, default=None):
+        return int(self.get(key, default))
+
+
+class RequestStub(object):
+    """
+    Minimal context for matching routes
+    """
+
+    def __init__(self, method, uri):
+        self.current_route = None
+        self.route_params = None
+        self._method = method
+        self._uri = uri
+
+    def get_request_method(self):
+        return self._method
+
+    def get_request_uri(self):
+        return self._uri
+
+    def set_route_params(self, params=None):
+        self.route_params = params
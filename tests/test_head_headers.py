@@ -0,0 +1,100 @@
+# coding: utf8
+
+from .helpers import DictConfig
+
+from os import path
+from shutil import rmtree
+from StringIO import StringIO
+from tempfile import mkdtemp
+import unittest
+
+from pygrim import json_method, Route, Server, template_method
+
+
+class HeadServer(Server):
+
+    template_dir = None
+
+    def _find_config_class(self):
+        self._config_dir = ""
+        return {
+            "context": {"auto_etag": True},
+            "jinja": {"template_path": self.template_dir},
+            "logging": {"file": "/dev/null", "level": "ERROR", "loggers": {}},
+            "pygrim": {
+                "compression": {"enabled": True},
+                "debug": False,
+                "head_skip_body": True
+            },
+            "session": {"enabled": False},
+            "view": {"type": "jinja"}
+        }, DictConfig
+
+    def _route_register_func(self, router):
+        router.map(Route("GET", "/data", "data"))
+        router.map(Route("GET", "/page", "page"))
+
+    @json_method()
+    def data(self, context):
+        return {"items": range(1000)}
+
+    @template_method("page.jinja")
+    def page(self, context):
+        return {"data": {"text": "lorem ipsum " * 200}}
+
+
+class HeadHeadersTest(unittest.TestCase):
+
+    def setUp(self):
+        self.template_dir = mkdtemp()
+        with open(path.join(self.template_dir, "page.jinja"), "w") as out:
+            out.write("<p>{{ text }}</p>")
+
+        HeadServer.template_dir = self.template_dir
+        self.server = HeadServer()
+        self.server.do_postfork()
+
+    def tearDown(self):
+        rmtree(self.template_dir)
+
+    def request(self, method, uri):
+        environment = {
+            "HTTP_ACCEPT_ENCODING": "gzip",
+            "HTTP_HOST": "example.com",
+            "PATH_INFO": uri,
+            "QUERY_STRING": "",
+            "REQUEST_METHOD": method,
+            "SERVER_NAME": "example.com",
+            "SERVER_PORT": "80",
+            "wsgi.input": StringIO(""),
+            "wsgi.url_scheme": "http"
+        }
+        response = {}
+
+        def start_response(status, headers):
+            response.update(status=status, headers=sorted(headers))
+
+        response["body"] = "".join(self.server(environment, start_response))
+        return response
+
+    def assert_head_matches_get(self, uri):
+        get = self.request("GET", uri)
+        head = self.request("HEAD", uri)
+        self.assertEqual(head["status"], get["status"])
+        self.assertEqual(head["headers"], get["headers"])
+        self.assertEqual(head["body"], "")
+        return dict(get["headers"])
+
+    def test_json_headers(self):
+        headers = self.assert_head_matches_get("/data")
+        self.assertIn("ETag", headers)
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+
+    def test_template_headers(self):
+        headers = self.assert_head_matches_get("/page")
+        self.assertIn("Content-Length", headers)
+        self.assertEqual(headers["Content-Encoding"], "gzip")
+
+
+if __name__ == "__main__":
+    unittest.main()
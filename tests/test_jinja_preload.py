@@ -0,0 +1,39 @@
+# coding: utf8
+
+from .helpers import DictConfig
+
+from os import path
+from shutil import rmtree
+from tempfile import mkdtemp
+import unittest
+
+from pygrim.components.view import JinjaView
+
+
+class JinjaPreloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.template_dir = mkdtemp()
+        with open(path.join(self.template_dir, "page.jinja"), "w") as out:
+            out.write("{{ value }}")
+
+        # not utf-8, e.g. favicon served from template directory
+        with open(path.join(self.template_dir, "favicon.png"), "wb") as out:
+            out.write("\x89PNG\r\n\x1a\n\xff\xfe\x00\x00")
+
+    def tearDown(self):
+        rmtree(self.template_dir)
+
+    def test_preload_skips_binary_files(self):
+        view = JinjaView(
+            DictConfig({"jinja": {"template_path": self.template_dir}}), {}
+        )
+        view.preload()
+        self.assertEqual(
+            [name for unused_, name in view._env.cache.iterkeys()],
+            ["page.jinja"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
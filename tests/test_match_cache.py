@@ -0,0 +1,56 @@
+# coding: utf8
+
+from .helpers import FlatConfig, RequestStub
+
+from re import compile as re_compile
+import unittest
+
+from pygrim.components.routing import Route, Router
+
+
+def to_tags(value):
+    return value.split(",")
+
+
+class MatchCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.router = Router()
+        self.router.configure(FlatConfig({"pygrim:route_cache_size": 8}))
+        self.router.map(Route(
+            "GET", re_compile(r"/tags/(?P<tags>[a-z,]+)/?$"), "tags",
+            converters={"tags": to_tags}
+        ))
+        self.router.map(Route(
+            "GET", re_compile(r"/items/(?P<item>[^/]+)/?$"), "item",
+            converters={"item": "int"}
+        ))
+        self.router.map(Route(
+            "GET", re_compile(r"/items/(?P<item>[^/]+)/?$"), "named_item"
+        ))
+        self.router.finalize()
+
+    def match(self, uri):
+        context = RequestStub("GET", uri)
+        route = next(self.router.matching_routes(context), None)
+        return route and route.get_handle_name(), context.route_params
+
+    def test_converted_params_are_not_shared(self):
+        handle, params = self.match("/tags/a,b")
+        self.assertEqual(handle, "tags")
+        params["tags"].append("c")
+        self.assertEqual(
+            self.match("/tags/a,b"), ("tags", {"tags": ["a", "b"]})
+        )
+        self.assertEqual(self.router.get_match_cache_stats()["hits"], 1)
+
+    def test_conversion_falls_through_on_every_hit(self):
+        for unused_ in xrange(2):
+            self.assertEqual(self.match("/items/12"), ("item", {"item": 12}))
+            self.assertEqual(
+                self.match("/items/twelve"),
+                ("named_item", {"item": "twelve"})
+            )
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+# coding: utf8
+
+from .helpers import FlatConfig, RequestStub
+
+from re import compile as re_compile
+import unittest
+
+from pygrim.components.routing import Route, Router
+
+
+class RootRouteReorderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.router = Router()
+        self.router.configure(FlatConfig({
+            "pygrim:route_reorder_interval": 1
+        }))
+        self.router.map(Route("GET", re_compile(r"/?$"), "home"))
+        self.router.map(
+            Route("GET", re_compile(r"/(?P<slug>[a-z-]*)/?$"), "page")
+        )
+        self.router.finalize()
+
+    def dispatch(self, uri):
+        route = next(self.router.matching_routes(RequestStub("GET", uri)))
+        self.router.after_request()
+        return route.get_handle_name()
+
+    def test_root_overlaps_catch_all(self):
+        stats = self.router.get_route_stats()
+        self.assertEqual(len(stats["overlapping"]), 1)
+        self.assertEqual(
+            [route["handle"] for route in stats["overlapping"][0]],
+            ["home", "page"]
+        )
+
+    def test_reorder_keeps_root_route_first(self):
+        for unused_ in xrange(3):
+            self.assertEqual(self.dispatch("/about"), "page")
+
+        self.assertEqual(self.dispatch("/"), "home")
+
+
+if __name__ == "__main__":
+    unittest.main()